@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import yaml
+
+from easyapplybot import EasyApplyBot, bot_from_config, setupLogger
+from replay import ReplayServer, synthesize
+
+log = logging.getLogger(__name__)
+
+
+class BenchmarkBot(EasyApplyBot):
+    # counts WebDriver round trips and times every job, otherwise the real bot
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.round_trips = 0
+        self.jobs: list = []  # (seconds, applied)
+        super().__init__(*args, **kwargs)
+
+    def create_browser(self):
+        browser = super().create_browser()
+        execute = browser.execute
+
+        # every WebDriver command goes through execute(), one HTTP round trip each
+        def counted(driver_command, params=None):
+            self.round_trips += 1
+            return execute(driver_command, params)
+
+        browser.execute = counted
+        return browser
+
+    def apply_to_job(self, jobID):
+        start = time.perf_counter()
+        result = super().apply_to_job(jobID)
+        self.jobs.append((time.perf_counter() - start, bool(result)))
+        return result
+
+
+def run(parameters: dict, recording: str, latency: float = 0.0, jitter: float = 0.0) -> dict:
+    # runs the bot against a replayed recording in a scratch directory, so the real
+    # output csv, applied jobs index and session cache are never touched
+    replay = ReplayServer(recording, latency=latency, jitter=jitter).start()
+    workdir = tempfile.mkdtemp(prefix="easyapplybot-bench-")
+    cwd = os.getcwd()
+    uploads = {key: os.path.abspath(path) for key, path in (parameters.get('uploads') or {}).items()}
+    if os.path.isfile("qa.csv"):
+        shutil.copy("qa.csv", os.path.join(workdir, "qa.csv"))
+    parameters = dict(parameters,
+                      uploads=uploads,
+                      base_url=replay.base_url,
+                      output_filename=[os.path.join(workdir, "out.csv")],
+                      applied_db=None,
+                      session_file=None,
+                      record_dir=None,
+                      workers=1,
+                      metrics_json=os.path.join(workdir, "metrics.json"),
+                      metrics_prom=None,
+                      # the replay server never throttles, measure the bot and not the pacing
+                      navigations_per_minute=60000,
+                      submissions_per_minute=60000,
+                      api_requests_per_minute=60000)
+    try:
+        os.chdir(workdir)
+        bot: BenchmarkBot = bot_from_config(parameters, bot_class=BenchmarkBot)
+        start = time.perf_counter()
+        bot.start_apply([p for p in parameters['positions'] if p is not None],
+                        [l for l in parameters['locations'] if l is not None])
+        elapsed = time.perf_counter() - start
+        bot.browser.quit()
+    finally:
+        os.chdir(cwd)
+        replay.stop()
+
+    jobs = len(bot.jobs)
+    applied = sum(1 for _, ok in bot.jobs if ok)
+    return {
+        "jobs": jobs,
+        "applications": applied,
+        "seconds": round(elapsed, 2),
+        "jobs_per_minute": round(jobs / (elapsed / 60), 2) if elapsed else 0.0,
+        "seconds_per_application": round(elapsed / applied, 2) if applied else None,
+        "seconds_per_job": round(sum(t for t, _ in bot.jobs) / jobs, 2) if jobs else None,
+        "round_trips": bot.round_trips,
+        "round_trips_per_job": round(bot.round_trips / jobs, 1) if jobs else None,
+        "replay_requests": replay.requests,
+        "latency": latency,
+        "phases": bot.metrics.summary()["phases"],
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the bot against a replayed recording")
+    parser.add_argument("recording", nargs="?",
+                        help="directory written with record_dir set in config.yaml, a synthetic "
+                             "recording of the configured searches is generated when omitted")
+    parser.add_argument("--jobs", type=int, default=10, help="jobs per search in a synthetic recording")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.0],
+                        help="per-request latency in seconds, one run per value")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as stream:
+        parameters = yaml.safe_load(stream)
+    setupLogger(parameters, "benchmark")
+
+    recording = args.recording
+    if recording is None:
+        # no network and no recording needed, e.g. in CI
+        recording = synthesize(tempfile.mkdtemp(prefix="easyapplybot-recording-"),
+                               [p for p in parameters['positions'] if p is not None],
+                               [l for l in parameters['locations'] if l is not None],
+                               parameters.get('experience_level'), jobs=args.jobs)
+    results = [run(parameters, recording, latency, args.jitter) for latency in args.latency]
+    for result in results:
+        log.info("latency %ss: %s jobs/min, %s s/application, %s round trips/job",
+                 result['latency'], result['jobs_per_minute'], result['seconds_per_application'],
+                 result['round_trips_per_job'])
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+# Network.setBlockedURLs patterns, '*' is the only wildcard CDP understands
+DEFAULT_BLOCKED_URLS = [
+    # images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*media.licdn.com/dms/image*",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # media
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8", "*dms.licdn.com/playlist*",
+    # analytics and tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*bat.bing.com*",
+    "*px.ads.linkedin.com*", "*linkedin.com/li/track*", "*linkedin.com/sensorCollect*",
+    "*snap.licdn.com*", "*platform.linkedin.com/litms*",
+]
+
+# Blocked requests never report a size, so bytes saved are estimated from typical
+# transfer sizes per resource type
+TYPICAL_BYTES = {
+    "Image": 25_000,
+    "Font": 40_000,
+    "Media": 500_000,
+    "Script": 30_000,
+    "XHR": 2_000,
+    "Fetch": 2_000,
+    "Ping": 500,
+    "Other": 5_000,
+}
+
+
+class ResourceBlocker:
+    # blocks resource requests through the DevTools protocol and keeps a per-run
+    # tally of what it saved, read from Chrome's performance log
+
+    def __init__(self, patterns: list | None = None) -> None:
+        self.patterns = list(DEFAULT_BLOCKED_URLS if patterns is None else patterns)
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+        self.bytes_received = 0
+        self.by_type: dict = {}
+        self.types: dict = {}  # requestId -> resource type
+
+    @staticmethod
+    def enable_logging(options) -> None:
+        # the performance log is where loadingFailed/blockedReason events show up
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def attach(self, browser) -> None:
+        browser.execute_cdp_cmd("Network.enable", {})
+        browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+        log.info("Blocking %s URL patterns", len(self.patterns))
+
+    def collect(self, browser) -> None:
+        # drains the performance log, has to be called regularly or chromedriver's
+        # buffer keeps growing
+        try:
+            entries = browser.get_log("performance")
+        except Exception as e:
+            log.debug("Performance log unavailable: %s", e)
+            return
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self.types[params["requestId"]] = params.get("type", "Other")
+            elif method == "Network.loadingFinished":
+                self.types.pop(params.get("requestId"), None)
+                self.bytes_received += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed":
+                kind = self.types.pop(params.get("requestId"), params.get("type", "Other"))
+                if params.get("blockedReason"):
+                    self.requests_blocked += 1
+                    self.bytes_saved += TYPICAL_BYTES.get(kind, TYPICAL_BYTES["Other"])
+                    self.by_type[kind] = self.by_type.get(kind, 0) + 1
+
+    def summary(self) -> dict:
+        return {
+            "requests_blocked": self.requests_blocked,
+            "estimated_bytes_saved": self.bytes_saved,
+            "bytes_received": self.bytes_received,
+            "blocked_by_type": dict(self.by_type),
+        }
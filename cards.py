@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+# Reads every job card on the search page in a single WebDriver round trip
+CARD_SNAPSHOT_JS = """
+function text(card, selector) {
+    var el = card.querySelector(selector);
+    return el ? el.textContent.trim().replace(/\\s+/g, ' ') : '';
+}
+var cards = document.querySelectorAll('div[data-job-id]');
+var out = [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    var footer = text(card, '.job-card-container__footer-wrapper, .job-card-list__footer-wrapper');
+    out.push({
+        jobID: card.getAttribute('data-job-id'),
+        title: text(card, '.job-card-list__title, .job-card-container__link strong, .artdeco-entity-lockup__title'),
+        company: text(card, '.job-card-container__primary-description, .job-card-container__company-name, .artdeco-entity-lockup__subtitle'),
+        location: text(card, '.job-card-container__metadata-item, .artdeco-entity-lockup__caption'),
+        applied: /\\bApplied\\b/.test(footer || card.textContent),
+        easy_apply: /Easy Apply/.test(footer || card.textContent)
+    });
+}
+return out;
+"""
+
+
+def harvest_cards(browser) -> list:
+    # [{jobID, title, company, location, applied, easy_apply}, ...]
+    cards = browser.execute_script(CARD_SNAPSHOT_JS) or []
+    log.debug("Harvested %s job cards", len(cards))
+    return cards
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from metrics import write_atomic
+
+log = logging.getLogger(__name__)
+
+
+def worker_path(path: str, worker_id: int | str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.worker{worker_id}{ext}"
+
+
+class Checkpoint:
+    # Progress of a run, rewritten atomically whenever it moves on:
+    #   combos     [position, location, start] scheduled for the run, in order
+    #   done       [position, location] finished
+    #   combo      [position, location] being searched, start its next &start= offset
+    #   pending    jobIDs harvested but not opened yet, in_flight the one being applied to
+    # In pool mode the parent writes combos, every worker its own file with the rest.
+    # A Checkpoint without a path keeps the state in memory only.
+
+    def __init__(self, path: str | None) -> None:
+        self.path = path
+        self.mutex = threading.Lock()
+        self.state: dict = {"combos": [], "done": [], "combo": None, "start": 0,
+                            "pending": [], "in_flight": None}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            write_atomic(self.path, json.dumps(dict(self.state, saved_at=time.time())))
+        except OSError as e:
+            log.error("Could not write checkpoint %s: %s", self.path, e)
+
+    def update(self, **changes) -> None:
+        with self.mutex:
+            self.state.update(changes)
+            self.save()
+
+    def reset(self, combos: list) -> None:
+        # a new (or resumed) run over these combos, earlier worker files are obsolete
+        self.clear()
+        self.update(combos=[list(c) for c in combos], done=[], combo=None, start=0,
+                    pending=[], in_flight=None)
+
+    def finish_combo(self) -> None:
+        with self.mutex:
+            if self.state["combo"] is not None:
+                self.state["done"].append(self.state["combo"])
+            self.state.update(combo=None, start=0)
+            self.save()
+
+    def clear(self) -> None:
+        if not self.path:
+            return
+        for path in [self.path] + glob.glob(worker_path(self.path, "*")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def read(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.error("Could not read checkpoint %s: %s", path, e)
+        return None
+
+
+def load_plan(path: str) -> dict | None:
+    # what is left of an interrupted run, from the checkpoint and any worker files:
+    #   combos  [position, location, start], interrupted ones first
+    #   jobIDs  harvested or in flight, not applied to yet
+    main = read(path)
+    if main is None:
+        return None
+    states = [main] + [s for s in map(read, sorted(glob.glob(worker_path(path, "*")))) if s]
+    done = set()
+    current: list = []
+    jobIDs: list = []
+    for state in states:
+        done.update(tuple(c) for c in state.get("done", []))
+        if state.get("combo"):
+            current.append([*state["combo"], state.get("start", 0)])
+        for jobID in [state.get("in_flight")] + state.get("pending", []):
+            if jobID and jobID not in jobIDs:
+                jobIDs.append(jobID)
+    started = done | {(c[0], c[1]) for c in current}
+    remaining = [c for c in main.get("combos", []) if (c[0], c[1]) not in started]
+    plan = {"combos": current + remaining, "jobIDs": jobIDs}
+    log.info("Resuming %s interrupted and %s remaining combos, %s pending jobs, from a checkpoint of %s",
+             len(current), len(remaining), len(jobIDs), time.ctime(main.get('saved_at', 0)))
+    return plan
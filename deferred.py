@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import logging
+
+from records import RecordWriter
+
+log = logging.getLogger(__name__)
+
+
+def answer_deferred(store, qa_file: str, ask=input) -> list:
+    # Asks for an answer to every question deferred jobs are waiting on, each one
+    # once however many jobs it holds up. Answers are appended to qa.csv, jobs with
+    # nothing left unanswered are requeued for the next run and returned.
+    questions = store.deferred_questions()
+    if not questions:
+        log.info("No deferred questions are waiting for answers")
+        return []
+    jobs = {jobID for jobIDs in questions.values() for jobID in jobIDs}
+    log.info("%s questions are holding up %s jobs, leave an answer empty to skip the question",
+             len(questions), len(jobs))
+
+    answered = []
+    writer = RecordWriter(qa_file, header=["Question", "Answer"])
+    try:
+        for question, jobIDs in questions.items():
+            answer = ask(f"[{len(jobIDs)} jobs] {question}\n").strip()
+            if answer:
+                writer.write([question, answer])
+                answered.append(question)
+    except (EOFError, KeyboardInterrupt):
+        # the answers given so far still count
+        log.info("Stopped answering")
+    finally:
+        writer.close()
+
+    requeued = store.answered(answered)
+    log.info("Saved %s answers to %s, requeued %s jobs", len(answered), qa_file, len(requeued))
+    return requeued
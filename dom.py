@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+# Evaluated inside the browser so only a boolean crosses the wire, never the page
+TEXT_PRESENT_JS = """
+var root = arguments[1] ? document.querySelector(arguments[1]) : document.body;
+return !!root && root.textContent.indexOf(arguments[0]) !== -1;
+"""
+
+
+def has_text(browser, text: str, selector: str | None = None) -> bool:
+    # whether `text` appears in the page, or in the first element matching `selector`
+    return bool(browser.execute_script(TEXT_PRESENT_JS, text, selector))
+
+
+class LazySoup:
+    # BeautifulSoup of the page, only downloaded and parsed when something actually
+    # reads it. Attribute access is forwarded to the soup, so it can be used like one.
+    # The parse reflects the page at the time of that first access.
+
+    def __init__(self, browser) -> None:
+        self.browser = browser
+        self._soup = None
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self.browser.page_source, "lxml")
+        return self._soup
+
+    def __getattr__(self, name):
+        return getattr(self.soup, name)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+DRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "easyapplybot", "driver.json")
+
+# resolved once per process, every browser we start afterwards reuses it
+_resolved: dict = {}
+
+
+def chrome_version() -> str | None:
+    # read from the local installation, no network involved
+    try:
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        log.debug("Could not detect the Chrome version: %s", e)
+        return None
+
+
+def major(version: str | None) -> str | None:
+    return version.split(".")[0] if version else None
+
+
+def load_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache_path: str, entry: dict) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, cache_path)
+
+
+def resolve_driver(cache_path: str = DRIVER_CACHE) -> str | None:
+    # chromedriver path for the installed Chrome. The cached path is used as long as it
+    # exists and was resolved for the same Chrome major version, so a normal start
+    # needs no network. None means "let Selenium find one on its own".
+    if cache_path in _resolved:
+        return _resolved[cache_path]
+
+    start = time.time()
+    version = chrome_version()
+    cached = load_cache(cache_path)
+    path = cached.get("driver_path")
+    usable = path is not None and os.path.isfile(path)
+
+    if usable and (version is None or major(cached.get("chrome_version")) == major(version)):
+        log.info("Using cached chromedriver %s", path)
+    else:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            save_cache(cache_path, {"driver_path": path, "chrome_version": version,
+                                    "resolved_at": time.time()})
+            log.info("Resolved chromedriver %s for Chrome %s", path, version)
+        except Exception as e:
+            # offline, fall back to a stale cached driver or to Selenium Manager / PATH
+            log.warning("chromedriver could not be downloaded: %s", e)
+            path = path if usable else None
+
+    log.debug("Driver resolution took %.2fs", time.time() - start)
+    _resolved[cache_path] = path
+    return path
@@ -1,22 +1,19 @@
 from __future__ import annotations
 
+import argparse
 import json
 import csv
 import logging
 import os
-import random
 import re
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import getpass
 from pathlib import Path
 
-import pandas as pd
-import pyautogui
 import yaml
-from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -25,34 +22,59 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 
-
-log = logging.getLogger(__name__)
+from blocking import ResourceBlocker
+from cards import harvest_cards
+from deferred import answer_deferred
+from checkpoint import Checkpoint, load_plan
+from dom import LazySoup, has_text
+from driver import resolve_driver
+from forms import fill_form, plan_fill, snapshot_form
+from governor import Governor
+from jobstore import AppliedJobStore
+from lifecycle import BrowserLifecycle
+from logconfig import set_context, setup_logging
+from metrics import Metrics, timed
+from modal import dismiss_modal, modal_state
+from pagination import Paginator, search_path
+from pipeline import consume
+from prescreen import PreScreen
+from qa_matcher import AnswerMatcher
+from readiness import PageReadiness
+from records import RecordWriter
+from replay import Recorder
+from rules import RuleSet
+from scheduler import ComboScheduler
+from session import SessionCache
+from workers import run_pool
 
 
-def setupLogger() -> None:
-    dt: str = datetime.strftime(datetime.now(), "%m_%d_%y %H_%M_%S ")
+log = logging.getLogger(__name__)
 
-    if not os.path.isdir('./logs'):
-        os.mkdir('./logs')
 
-    # TODO need to check if there is a log dir available or not
-    logging.basicConfig(filename=('./logs/' + str(dt) + 'applyJobs.log'), filemode='w',
-                        format='%(asctime)s::%(name)s::%(levelname)s::%(message)s', datefmt='./logs/%d-%b-%y %H:%M:%S')
-    log.setLevel(logging.DEBUG)
-    c_handler = logging.StreamHandler()
-    c_handler.setLevel(logging.DEBUG)
-    c_format = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s', '%H:%M:%S')
-    c_handler.setFormatter(c_format)
-    log.addHandler(c_handler)
+def setupLogger(parameters: dict | None = None, name: str = "applyJobs") -> None:
+    # queued, rotating, rate limited logging to ./logs and the console, see logconfig
+    parameters = parameters or {}
+    setup_logging(name,
+                  level=parameters.get('log_level', 'INFO'),
+                  json_records=parameters.get('log_json', True),
+                  max_mb=parameters.get('log_max_mb', 20),
+                  backups=parameters.get('log_backups', 5),
+                  rate_limit=parameters.get('log_rate_limit', 60))
 
 
 class EasyApplyBot:
-    setupLogger()
     # MAX_SEARCH_TIME is 10 hours by default, feel free to modify it
     MAX_SEARCH_TIME = 60 * 60
+    # deadline for a page to become ready before we move on with whatever is there
+    PAGE_TIMEOUT = 10
+    # how long we wait for the login to go through, leaves time for a verification prompt
+    LOGIN_TIMEOUT = 60
+    # bounds for the Easy Apply modal: steps per application, seconds for a step to
+    # render and attempts at answering the questions of one step
+    MAX_FORM_STEPS = 12
+    STEP_TIMEOUT = 10
+    MAX_QUESTION_RETRIES = 2
 
     def __init__(self,
                  username,
@@ -64,27 +86,110 @@ class EasyApplyBot:
                  filename='output.csv',
                  blacklist=[],
                  blackListTitles=[],
-                 experience_level=[]
+                 rules=None,
+                 experience_level=[],
+                 applied_db=None,
+                 retention_days=2,
+                 pipeline=False,
+                 pipeline_queue=50,
+                 session_file='session.json',
+                 headless=False,
+                 block_resources=False,
+                 blocked_urls=None,
+                 flush_rows=20,
+                 flush_seconds=5,
+                 durability='flush',
+                 max_pages=40,
+                 max_search_minutes=None,
+                 combo_weights=None,
+                 combo_exclude=None,
+                 metrics_json='metrics.json',
+                 metrics_prom='metrics.prom',
+                 metrics_interval=30,
+                 base_url='https://www.linkedin.com',
+                 record_dir=None,
+                 prescreen=True,
+                 prescreen_concurrency=8,
+                 navigations_per_minute=30,
+                 submissions_per_minute=6,
+                 rate_burst=3,
+                 api_requests_per_minute=120,
+                 governor_state=None,
+                 checkpoint_file='checkpoint.json',
+                 unknown_questions='defer',
+                 recycle_rss_mb=1500,
+                 recycle_navigations=300
                  ) -> None:
 
+        startup: float = time.time()
+        self.metrics = Metrics(metrics_json, metrics_prom, metrics_interval)
+        # every LinkedIn URL is built on this, a replay server can stand in for it
+        self.base_url: str = base_url.rstrip('/')
+        # saves search, job and form step pages for the replay server when set
+        self.recorder = Recorder(record_dir) if record_dir else None
+        self.current_job = None
+        # defer: park jobs with unanswerable questions for --answer, ask: prompt for them
+        if unknown_questions not in ("defer", "ask"):
+            raise ValueError(f"unknown_questions must be 'defer' or 'ask', not {unknown_questions!r}")
+        self.unknown_questions = unknown_questions
+        self.deferred = False  # whether the last send_resume() parked its job
+        # combos, page offset and pending jobs of this run, for --resume after a crash
+        self.checkpoint = Checkpoint(checkpoint_file)
+        # paces navigations and submissions, slows down when LinkedIn pushes back.
+        # Workers share one through governor_state.
+        self.governor = Governor(navigations_per_minute, submissions_per_minute,
+                                 burst=rate_burst, state=governor_state,
+                                 api_requests_per_minute=api_requests_per_minute)
+        self.page_state = None  # readiness result of the last load_page()
+        self.page_signal = None  # throttle sign the governor saw on the last load_page()
         # Convert relative paths to absolute paths for uploads
         for key, path in uploads.items():
             if not os.path.isabs(path):
                 uploads[key] = os.path.abspath(path)
-                log.info(f"Converting {key} path to absolute: {uploads[key]}")
+                log.info("Converting %s path to absolute: %s", key, uploads[key])
 
         self.uploads = uploads
+        # budgets for a single (position, location) search
+        self.max_pages = max_pages
+        self.max_search_time = self.MAX_SEARCH_TIME if max_search_minutes is None else max_search_minutes * 60
+        self.combo_weights = combo_weights or {}
+        self.combo_exclude = combo_exclude or []
+        # (position, location) being searched, written with every output row
+        self.current_combo: tuple = ("", "")
         self.salary = salary
         self.rate = rate
-        past_ids: list | None = self.get_appliedIDs(filename)
-        self.appliedJobIDs: list = past_ids if past_ids != None else []
         self.filename: str = filename
+        # jobs handled within the retention window, consulted before every navigation
+        if applied_db is None:
+            applied_db = os.path.splitext(filename)[0] + ".db"
+        self.applied_store = AppliedJobStore(applied_db, retention_days)
+        self.applied_store.import_csv(filename)
+        self.out_writer = RecordWriter(filename, flush_rows=flush_rows,
+                                       flush_seconds=flush_seconds, durability=durability)
+        self.headless = headless
+        # CDP level blocking of images, fonts, media and trackers
+        self.blocker = ResourceBlocker(blocked_urls) if block_resources else None
         self.options = self.browser_options()
-        self.browser = webdriver.Chrome(service=ChromeService(
-            ChromeDriverManager().install()), options=self.options)
+        self.driver_path = resolve_driver()
+        self.browser = self.create_browser()
+        # recycles the browser as it grows, replaces it when the driver dies
+        self.lifecycle = BrowserLifecycle(recycle_rss_mb, recycle_navigations)
+        self.lifecycle.attach(self.browser)
+        # second session used by the pipelined mode to harvest search pages, started
+        # afresh for the next combo once the main browser has been replaced
+        self.harvest_browser = None
+        self.harvest_stale = False
+        self.pipeline = pipeline
+        self.pipeline_queue = pipeline_queue
+        self.session_cache = SessionCache(session_file, self.base_url) if session_file else None
         self.wait = WebDriverWait(self.browser, 30)
-        self.blacklist = blacklist
-        self.blackListTitles = blackListTitles
+        self.readiness = PageReadiness(self.browser, timeout=self.PAGE_TIMEOUT)
+        # include/exclude rules on title, company and location, checked on the job
+        # cards before anything is opened
+        self.rules = RuleSet(rules, blacklist, blackListTitles)
+        # job posting metadata fetched over HTTP, ineligible jobs are never opened
+        self.prescreen = PreScreen(self.base_url, self.rules, concurrency=prescreen_concurrency,
+                                   governor=self.governor) if prescreen else None
         self.phone_number = phone_number
         self.experience_level = experience_level
 
@@ -95,22 +200,27 @@ class EasyApplyBot:
         # Load or create QA file
         if os.path.isfile(self.qa_file):
             try:
-                df = pd.read_csv(self.qa_file, encoding='utf-8')
-                self.answers = dict(
-                    zip(df['Question'].str.lower(), df['Answer']))
-                log.info(f"Loaded {len(self.answers)
-                                   } QA pairs from {self.qa_file}")
+                with open(self.qa_file, newline='', encoding='utf-8') as f:
+                    self.answers = {row['Question'].lower(): row['Answer']
+                                    for row in csv.DictReader(f) if row.get('Question')}
+                log.info("Loaded %s QA pairs from %s", len(self.answers), self.qa_file)
             except Exception as e:
-                log.error(f"Error loading QA file: {str(e)}")
+                log.error("Error loading QA file: %s", e)
                 self.answers = {}
         else:
-            df = pd.DataFrame(columns=["Question", "Answer"])
-            df.to_csv(self.qa_file, index=False, encoding='utf-8')
-            log.info(f"Created new QA file at {self.qa_file}")
+            with open(self.qa_file, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(["Question", "Answer"])
+            log.info("Created new QA file at %s", self.qa_file)
+
+        self.qa_writer = RecordWriter(self.qa_file, header=["Question", "Answer"], flush_rows=flush_rows,
+                                      flush_seconds=flush_seconds, durability=durability)
+
+        # built once here, new answers are added to it as qa.csv grows
+        self.matcher = AnswerMatcher(self.answers, self.answer_patterns())
 
         log.info("Welcome to Easy Apply Bot")
         dirpath: str = os.getcwd()
-        log.info("current directory is : " + dirpath)
+        log.info("current directory is : %s", dirpath)
         log.info("Please wait while we prepare the bot for you")
         if experience_level:
             experience_levels = {
@@ -123,21 +233,16 @@ class EasyApplyBot:
             }
             applied_levels = [experience_levels[level]
                               for level in experience_level]
-            log.info("Applying for experience level roles: " +
-                     ", ".join(applied_levels))
+            log.info("Applying for experience level roles: %s", ", ".join(applied_levels))
         else:
             log.info("Applying for all experience levels")
 
+        # kept for logging in again should a replaced browser not get the session back
+        self.credentials = (username, password)
         self.start_linkedin(username, password)
+        log.info("Startup took %.1fs", time.time() - startup)
 
         self.locator = {
-            "next": (By.CSS_SELECTOR, "button[aria-label='Continue to next step']"),
-            "review": (By.CSS_SELECTOR, "button[aria-label='Review your application']"),
-            "submit": (By.CSS_SELECTOR, "button[aria-label='Submit application']"),
-            "error": (By.CLASS_NAME, "artdeco-inline-feedback__message"),
-            "upload_resume": (By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-resume')]"),
-            "upload_cv": (By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-cover-letter')]"),
-            "follow": (By.CSS_SELECTOR, "label[for='follow-company-checkbox']"),
             "upload": (By.NAME, "file"),
             "search": (By.CLASS_NAME, "jobs-search-results-list"),
             "links": ("xpath", '//div[@data-job-id]'),
@@ -151,29 +256,89 @@ class EasyApplyBot:
 
         }
 
-    def get_appliedIDs(self, filename) -> list | None:
-        try:
-            df = pd.read_csv(filename,
-                             header=None,
-                             names=['timestamp', 'jobID', 'job',
-                                    'company', 'attempted', 'result'],
-                             lineterminator='\n',
-                             encoding='utf-8')
-
-            df['timestamp'] = pd.to_datetime(
-                df['timestamp'], format="%Y-%m-%d %H:%M:%S")
-            df = df[df['timestamp'] > (datetime.now() - timedelta(days=2))]
-            jobIDs: list = list(df.jobID)
-            log.info(f"{len(jobIDs)} jobIDs found")
-            return jobIDs
-        except Exception as e:
-            log.info(
-                str(e) + "   jobIDs could not be loaded from CSV {}".format(filename))
-            return None
+    def create_browser(self):
+        browser = webdriver.Chrome(service=ChromeService(self.driver_path), options=self.options)
+        if self.blocker is not None:
+            self.blocker.attach(browser)
+        return browser
+
+    def maintain_browser(self) -> None:
+        reason = self.lifecycle.due()
+        if reason is not None:
+            self.lifecycle.recycles += 1
+            self.replace_browser(f"recycling after {reason}", alive=True)
+
+    def ensure_browser(self) -> bool:
+        # True when the browser still answers, otherwise it is replaced
+        if self.lifecycle.alive():
+            return True
+        self.lifecycle.restarts += 1
+        self.replace_browser("driver is dead or not responding", alive=False)
+        return False
+
+    @timed("browser_replace")
+    def replace_browser(self, reason, alive) -> None:
+        # swaps in a fresh browser carrying over the logged in session: captured from
+        # the old browser while it still answers, else the session cache, else a login
+        log.info("Replacing the browser: %s", reason)
+        session = self.session_cache or SessionCache(None, self.base_url)
+        state = None
+        if alive:
+            try:
+                state = session.capture(self.browser)
+                self.browser.quit()
+            except Exception as e:
+                log.debug("Could not close the old browser cleanly: %s", e)
+                self.lifecycle.kill()
+        else:
+            self.lifecycle.kill()
+
+        self.browser = self.create_browser()
+        self.lifecycle.attach(self.browser)
+        self.wait = WebDriverWait(self.browser, 30)
+        self.readiness = PageReadiness(self.browser, timeout=self.PAGE_TIMEOUT)
+        if self.prescreen is not None:
+            self.prescreen.headers = None
+        # a harvester may be using it right now, it is swapped when the next combo starts
+        self.harvest_stale = True
+        self.fill_data()
+        if state is not None and session.apply(self.browser, state):
+            log.info("Session carried over to the new browser")
+        else:
+            self.start_linkedin(*self.credentials)
+
+    def get_harvest_browser(self):
+        # lazily started, shares the logged in session through the main browser's cookies
+        if self.harvest_stale:
+            self.close_harvest_browser()
+            self.harvest_stale = False
+        if self.harvest_browser is None:
+            self.harvest_browser = self.create_browser()
+            self.harvest_browser.get(self.base_url + "/robots.txt")
+            for cookie in self.browser.get_cookies():
+                cookie.pop("sameSite", None)
+                try:
+                    self.harvest_browser.add_cookie(cookie)
+                except Exception as e:
+                    log.debug("Could not copy cookie %s: %s", cookie.get('name'), e)
+        return self.harvest_browser
+
+    def close_harvest_browser(self) -> None:
+        if self.harvest_browser is not None:
+            try:
+                self.harvest_browser.quit()
+            except Exception as e:
+                log.debug("Could not close the harvest browser: %s", e)
+            self.harvest_browser = None
 
     def browser_options(self):
         options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-gpu")
+        else:
+            options.add_argument("--start-maximized")
         options.add_argument("--ignore-certificate-errors")
         options.add_argument('--no-sandbox')
         options.add_argument("--disable-extensions")
@@ -186,11 +351,20 @@ class EasyApplyBot:
 
         # Load user profile
         # options.add_argument(r"--user-data-dir={}".format(self.profile_path))
+        if self.blocker is not None:
+            ResourceBlocker.enable_logging(options)
         return options
 
-    def start_linkedin(self, username, password) -> None:
+    @timed("login", outcome=lambda how: how)
+    def start_linkedin(self, username, password) -> str:
+        if self.session_cache is not None and self.session_cache.restore(self.browser):
+            return "cached"
+        return self.login(username, password)
+
+    def login(self, username, password) -> str:
         log.info("Logging in.....Please wait :)  ")
-        self.browser.get("https://www.linkedin.com/login/")
+        self.pace("navigate")
+        self.browser.get(self.base_url + "/login/")
         try:
             user_field = self.browser.find_element("id", "username")
             pw_field = self.browser.find_element("id", "password")
@@ -201,11 +375,13 @@ class EasyApplyBot:
 
             user_field.send_keys(username)
             user_field.send_keys(Keys.TAB)
-            time.sleep(2)
             pw_field.send_keys(password)
-            time.sleep(2)
             login_button.click()
-            time.sleep(15)
+            # done once LinkedIn navigates away from the login and verification pages
+            WebDriverWait(self.browser, self.LOGIN_TIMEOUT).until(
+                lambda d: not any(part in d.current_url for part in ("/login", "/checkpoint", "/uas/")))
+            if self.session_cache is not None:
+                self.session_cache.save(self.browser)
             # if self.is_present(self.locator["2fa_oneClick"]):
             #     oneclick_auth = self.browser.find_element(by='id', value='reset-password-submit-button')
             #     if oneclick_auth is not None:
@@ -213,168 +389,241 @@ class EasyApplyBot:
             #         time.sleep(15)
             # else:
             #     time.sleep()
+            return "login"
         except TimeoutException:
             log.info(
-                "TimeoutException! Username/password field or login button not found")
+                "TimeoutException! Username/password field or login button not found, or login did not complete")
+            return "timeout"
 
     def fill_data(self) -> None:
+        if self.headless:
+            return
         self.browser.set_window_size(1, 1)
         self.browser.set_window_position(2000, 2000)
 
-    def start_apply(self, positions, locations) -> None:
-        start: float = time.time()
+    def start_apply(self, positions, locations, plan=None) -> None:
         self.fill_data()
         self.positions = positions
         self.locations = locations
-        combos: list = []
-        while len(combos) < len(positions) * len(locations):
-            position = positions[random.randint(0, len(positions) - 1)]
-            location = locations[random.randint(0, len(locations) - 1)]
-            combo: tuple = (position, location)
-            if combo not in combos:
-                combos.append(combo)
-                log.info(f"Applying to {position}: {location}")
+        if plan is None:
+            # best yielding combos first, based on the history in the output file
+            scheduler = ComboScheduler(positions, locations, self.filename,
+                                       weights=self.combo_weights, exclude=self.combo_exclude)
+            combos, jobIDs = [(position, location, 0) for position, location in scheduler], []
+        else:
+            # resumed from a checkpoint, see load_plan()
+            combos, jobIDs = plan["combos"], plan["jobIDs"]
+        # jobs whose deferred questions have been answered since
+        jobIDs += [jobID for jobID in self.applied_store.requeued() if jobID not in jobIDs]
+        self.checkpoint.reset(combos)
+        try:
+            if jobIDs:
+                for jobID in jobIDs:
+                    self.applied_store.release(jobID)
+                self.apply_loop({jobID: "To be processed" for jobID in jobIDs})
+            for position, location, offset in combos:
+                log.info("Applying to %s: %s", position, location)
                 location = "&location=" + location
-                self.applications_loop(position, location)
-            if len(combos) > 500:
-                break
+                self.run_combo(position, location, offset)
+        finally:
+            # the main browser is left open, the harvest browser would outlive us
+            self.close_harvest_browser()
+
+        if self.blocker is not None:
+            log.info("Resource blocking: %s", self.blocker.summary())
+        if self.prescreen is not None:
+            log.info("Pre-screen verdicts: %s", self.prescreen.summary())
+        log.info("Rule hits: %s", self.rules.summary())
+        log.info("Rate governor: %s", self.governor.summary())
+        log.info("Browser lifecycle: %s", self.lifecycle.summary())
+        self.out_writer.flush()
+        self.qa_writer.flush()
+        self.metrics.export()
+        log.info("Timings: %s", self.metrics.summary())
+        # the run is complete, nothing to resume
+        self.checkpoint.clear()
+
+    def run_combo(self, position, location, start=0) -> None:
+        self.current_combo = (position, location.removeprefix("&location="))
+        set_context(combo="|".join(self.current_combo))
+        self.checkpoint.update(combo=list(self.current_combo), start=start)
+        if self.pipeline:
+            consume(self, position, location, self.pipeline_queue, start)
+        else:
+            self.applications_loop(position, location, start)
+        self.checkpoint.finish_combo()
 
     # self.finish_apply() --> this does seem to cause more harm than good, since it closes the browser which we usually don't want, other conditions will stop the loop and just break out
 
-    def applications_loop(self, position, location):
+    def applications_loop(self, position, location, start=0):
 
-        count_application = 0
-        count_job = 0
-        jobs_per_page = 0
-        start_time: float = time.time()
+        # &start= offset, end of results and the per-combo page/time budgets
+        paginator = Paginator(self.max_pages, self.max_search_time, start=start)
 
         log.info("Looking for jobs.. Please wait..")
 
-        self.browser.set_window_position(1, 1)
-        self.browser.maximize_window()
-        self.browser, _ = self.next_jobs_page(
-            position, location, jobs_per_page, experience_level=self.experience_level)
-        log.info("Looking for jobs.. Please wait..")
+        if not self.headless:
+            self.browser.set_window_position(1, 1)
+            self.browser.maximize_window()
 
-        while time.time() - start_time < self.MAX_SEARCH_TIME:
+        while paginator.has_next():
             try:
-                log.info(f"{(self.MAX_SEARCH_TIME - (time.time() -
-                         start_time)) // 60} minutes left in this search")
-
-                # sleep to make sure everything loads, add random to make us look human.
-                randoTime: float = random.uniform(1.5, 2.9)
-                log.debug(f"Sleeping for {round(randoTime, 1)}")
-                # time.sleep(randoTime)
-                self.load_page(sleep=0.5)
-
-                # LinkedIn displays the search results in a scrollable <div> on the left side, we have to scroll to its bottom
-
-                # scroll to bottom
-
-                if self.is_present(self.locator["search"]):
-                    scrollresults = self.get_elements("search")
-                    #     self.browser.find_element(By.CLASS_NAME,
-                    #     "jobs-search-results-list"
-                    # )
-                    # Selenium only detects visible elements; if we scroll to the bottom too fast, only 8-9 results will be loaded into IDs list
-                    for i in range(300, 3000, 100):
-                        self.browser.execute_script(
-                            "arguments[0].scrollTo(0, {})".format(i), scrollresults[0])
-                    scrollresults = self.get_elements("search")
-                    # time.sleep(1)
-
-                # get job links, (the following are actually the job card objects)
-                if self.is_present(self.locator["links"]):
-                    links = self.get_elements("links")
-                # links = self.browser.find_elements("xpath",
-                #     '//div[@data-job-id]'
-                # )
-
-                    jobIDs = {}  # {Job id: processed_status}
-
-                    # children selector is the container of the job cards on the left
-                    for link in links:
-                        if 'Applied' not in link.text:  # checking if applied already
-                            if link.text not in self.blacklist:  # checking if blacklisted
-                                jobID = link.get_attribute("data-job-id")
-                                if jobID == "search":
-                                    log.debug(
-                                        "Job ID not found, search keyword found instead? {}".format(link.text))
-                                    continue
-                                else:
-                                    jobIDs[jobID] = "To be processed"
-                    if len(jobIDs) > 0:
-                        self.apply_loop(jobIDs)
-                    self.browser, jobs_per_page = self.next_jobs_page(position,
-                                                                      location,
-                                                                      jobs_per_page,
-                                                                      experience_level=self.experience_level)
-                else:
-                    self.browser, jobs_per_page = self.next_jobs_page(position,
-                                                                      location,
-                                                                      jobs_per_page,
-                                                                      experience_level=self.experience_level)
+                log.info("%s minutes left in this search", paginator.remaining() // 60)
+                # next_jobs_page returns once the lazy-loaded job card count stops changing.
+                # Loaded on every pass, a failed pass may have left the browser on a job page.
+                self.browser, _ = self.next_jobs_page(position,
+                                                      location,
+                                                      paginator.start,
+                                                      experience_level=self.experience_level)
+
+                # snapshot of the job cards on the left, taken in a single script call
+                with self.metrics.span("card_harvest"):
+                    links = harvest_cards(self.browser)
+                fresh = paginator.record(links)
+                log.debug("%s job cards on page %s, %s new", len(links), paginator.pages, fresh)
+
+                jobIDs = self.filter_cards(links)  # {Job id: processed_status}
+                if len(jobIDs) > 0:
+                    self.apply_loop(jobIDs)
+                # this page is done, a resumed run starts at the next one
+                self.checkpoint.update(start=paginator.start)
 
             except Exception as e:
-                print(e)
+                log.error("Search page %s failed: %s", paginator.pages, e)
+                paginator.failed()
+                # a dead or hung driver would fail every page from here on
+                self.ensure_browser()
+
+    def filter_cards(self, links) -> dict:
+        jobIDs = {}
+        for link in links:
+            jobID = link["jobID"]
+            if link["applied"]:  # checking if applied already
+                continue
+            reason = self.rules.reject(link)
+            if reason is not None:
+                log.debug("Skipping %s, rejected by rule '%s'", jobID, reason)
+                continue
+            if not jobID or jobID == "search":
+                log.debug("Job ID not found, search keyword found instead? %s", link["title"])
+                continue
+            elif jobID in self.applied_store:
+                log.debug("Skipping %s, already handled", jobID)
+                continue
+            else:
+                jobIDs[jobID] = "To be processed"
+        return jobIDs
+
+    @timed("prescreen")
+    def prescreen_jobs(self, jobIDs) -> None:
+        # drops the jobs the posting API already shows as ineligible, concurrently and
+        # before any of them is opened in the browser
+        if self.prescreen is None:
+            return
+        pending = [jobID for jobID, status in jobIDs.items() if status == "To be processed"]
+        if self.prescreen.needs_cookies:
+            self.prescreen.use_cookies(self.browser.get_cookies())
+        for jobID, result in self.prescreen.screen(pending).items():
+            if result not in ("eligible", "unknown"):
+                log.info("Skipping %s, pre-screen says %s", jobID, result)
+                self.applied_store.add(jobID, result)
+                jobIDs[jobID] = False
 
     def apply_loop(self, jobIDs):
+        self.prescreen_jobs(jobIDs)
+        pending = [jobID for jobID, status in jobIDs.items() if status == "To be processed"]
+        self.checkpoint.update(pending=list(pending))
         for jobID in jobIDs:
             if jobIDs[jobID] == "To be processed":
-                applied = self.apply_to_job(jobID)
+                pending.remove(jobID)
+                # another worker sharing the applied jobs index may already have it
+                if not self.applied_store.claim(jobID):
+                    log.debug("Skipping %s, claimed by another worker", jobID)
+                    jobIDs[jobID] = False
+                    continue
+                self.checkpoint.update(pending=list(pending), in_flight=jobID)
+                # between two jobs is the safe point to recycle the browser
+                self.maintain_browser()
+                set_context(jobID=jobID)
+                try:
+                    applied = self.apply_to_job(jobID)
+                except Exception as e:
+                    # one bad job must not end the search it came from
+                    log.error("Job %s failed: %s", jobID, e)
+                    self.applied_store.add(jobID, "error")
+                    self.ensure_browser()
+                    applied = False
                 if applied:
-                    log.info(f"Applied to {jobID}")
+                    log.info("Applied to %s", jobID)
                 else:
-                    log.info(f"Failed to apply to {jobID}")
-                jobIDs[jobID] == applied
+                    log.info("Failed to apply to %s", jobID)
+                jobIDs[jobID] = applied
+        self.checkpoint.update(pending=[], in_flight=None)
+        set_context(jobID=None)
 
     def apply_to_job(self, jobID):
         # #self.avoid_lock() # annoying
 
-        # get job page
+        self.current_job = jobID
+        # get job page, returns once the apply button or applied banner shows up
         self.get_job_page(jobID)
 
-        # let page load
-        time.sleep(1)
-
         # get easy apply button
         button = self.get_easy_apply_button()
 
         # word filter to skip positions not wanted
         if button is not False:
-            if any(word in self.browser.title for word in blackListTitles):
+            # jobs that reach the browser without a card (worker job tasks) are only
+            # judged here
+            if self.rules.reject({"title": self.browser.title}):
                 log.info(
                     'skipping this application, a blacklisted keyword was found in the job position')
                 string_easy = "* Contains blacklisted keyword"
+                outcome = "blacklisted"
                 result = False
             else:
                 string_easy = "* has Easy Apply Button"
                 log.info("Clicking the EASY apply button")
                 button.click()
                 clicked = True
-                time.sleep(1)
-                self.fill_out_fields()
-                result: bool = self.send_resume()
+                # wait for the modal's first step instead of a fixed sleep
+                if modal_state(self.readiness, self.STEP_TIMEOUT, seen=False)["state"] == "timeout":
+                    log.info("The Easy Apply modal did not open")
+                    self.deferred = False
+                    result = False
+                else:
+                    self.fill_out_fields()
+                    result: bool = self.send_resume()
                 if result:
                     string_easy = "*Applied: Sent Resume"
+                    outcome = "applied"
+                elif self.deferred:
+                    string_easy = "*Did not apply: Deferred, questions need answers"
+                    outcome = "deferred"
                 else:
                     string_easy = "*Did not apply: Failed to send Resume"
-        elif "You applied on" in self.browser.page_source:
+                    outcome = "failed"
+        elif self.page_state == "applied" or has_text(self.browser, "You applied on"):
             log.info("You have already applied to this position.")
             string_easy = "* Already Applied"
+            outcome = "already_applied"
             result = False
         else:
             log.info("The Easy apply button does not exist.")
             string_easy = "* Doesn't have Easy Apply Button"
+            outcome = "no_easy_apply"
             result = False
 
         # position_number: str = str(count_job + jobs_per_page)
-        log.info(f"\nPosition {jobID}:\n {
-                 self.browser.title} \n {string_easy} \n")
+        # one round trip for the title, shared by the log and the output row
+        title = self.browser.title
+        log.info("\nPosition %s:\n %s \n %s \n", jobID, title, string_easy)
 
-        self.write_to_file(button, jobID, self.browser.title, result)
+        self.write_to_file(button, jobID, title, result)
+        self.applied_store.add(jobID, outcome)
         return result
 
+    @timed("write")
     def write_to_file(self, button, jobID, browserTitle, result) -> None:
         def re_extract(text, pattern):
             target = re.search(pattern, text)
@@ -384,21 +633,28 @@ class EasyApplyBot:
 
         timestamp: str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         attempted: bool = False if button == False else True
-        job = re_extract(browserTitle.split(' | ')[0], r"\(?\d?\)?\s?(\w.*)")
-        company = re_extract(browserTitle.split(' | ')[1], r"(\w.*)")
+        # "Job | Company | LinkedIn", an error page's title has no company part
+        parts = browserTitle.split(' | ')
+        job = re_extract(parts[0], r"\(?\d?\)?\s?(\w.*)")
+        company = re_extract(parts[1], r"(\w.*)") if len(parts) > 1 else None
 
-        toWrite: list = [timestamp, jobID, job, company, attempted, result]
-        with open(self.filename, 'a+') as f:
-            writer = csv.writer(f)
-            writer.writerow(toWrite)
+        position, location = self.current_combo
+        toWrite: list = [timestamp, jobID, job, company, attempted, result, position, location]
+        self.out_writer.write(toWrite)
 
+    @timed("job_page")
     def get_job_page(self, jobID):
 
-        job: str = 'https://www.linkedin.com/jobs/view/' + str(jobID)
+        job: str = self.base_url + '/jobs/view/' + str(jobID)
+        self.pace("navigate")
+        self.lifecycle.navigated()
         self.browser.get(job)
-        self.job_page = self.load_page(sleep=0.5)
+        self.job_page = self.load_page(self.readiness.job_page)
+        if self.recorder is not None:
+            self.recorder.page(self.browser)
         return self.job_page
 
+    @timed("easy_apply_button", outcome=lambda button: "missing" if button is False else "found")
     def get_easy_apply_button(self):
         EasyApplyButton = False
         try:
@@ -415,22 +671,16 @@ class EasyApplyBot:
                     log.debug("Easy Apply button not found")
 
         except Exception as e:
-            print("Exception:", e)
-            log.debug("Easy Apply button not found")
+            log.debug("Easy Apply button lookup failed: %s", e)
 
         return EasyApplyButton
 
     def fill_out_fields(self):
-        fields = self.browser.find_elements(
-            By.CLASS_NAME, "jobs-easy-apply-form-section__grouping")
-        for field in fields:
-
-            if "Mobile phone number" in field.text:
-                field_input = field.find_element(By.TAG_NAME, "input")
-                field_input.clear()
-                field_input.send_keys(self.phone_number)
-
-        return
+        fills = []
+        for field in snapshot_form(self.browser):
+            if "Mobile phone number" in field["label"] and field["type"] == "text":
+                fills.append(plan_fill(field, self.phone_number))
+        fill_form(self.browser, fills)
 
     def get_elements(self, type) -> list:
         elements = []
@@ -444,285 +694,226 @@ class EasyApplyBot:
                                               locator[1])) > 0
 
     def send_resume(self) -> bool:
-        def is_present(button_locator) -> bool:
-            return len(self.browser.find_elements(button_locator[0],
-                                                  button_locator[1])) > 0
-
+        # Bounded state machine over the Easy Apply modal. Each pass classifies the
+        # current step with one script call and acts on it:
+        #   next / review -> upload documents if asked, click through
+        #   submit        -> untick "follow company", submit
+        #   error         -> answer the questions, retry the step a limited number of times
+        #   success       -> done
+        #   closed / timeout, or out of steps -> give up
+        submitted = False
+        self.deferred = False
+        uploaded: set = set()
+        followed = False
+        retries = 0
+        previous = None  # the step last clicked through
+        submitting = False  # whether that click was on the submit button
         try:
-            # time.sleep(random.uniform(1.5, 2.5))
-            next_locator = (By.CSS_SELECTOR,
-                            "button[aria-label='Continue to next step']")
-            review_locator = (By.CSS_SELECTOR,
-                              "button[aria-label='Review your application']")
-            submit_locator = (By.CSS_SELECTOR,
-                              "button[aria-label='Submit application']")
-            error_locator = (By.CLASS_NAME, "artdeco-inline-feedback__message")
-            upload_resume_locator = (
-                By.XPATH, '//span[text()="Upload resume"]')
-            upload_cv_locator = (
-                By.XPATH, '//span[text()="Upload cover letter"]')
-            # WebElement upload_locator = self.browser.find_element(By.NAME, "file")
-            follow_locator = (
-                By.CSS_SELECTOR, "label[for='follow-company-checkbox']")
-
-            submitted = False
-            loop = 0
-            while loop < 2:
-                time.sleep(1)
-                # Upload resume
-                if is_present(upload_resume_locator):
-                    # upload_locator = self.browser.find_element(By.NAME, "file")
-                    try:
-                        resume_locator = self.browser.find_element(
-                            By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-resume')]")
-                        resume = self.uploads["Resume"]
-                        resume_locator.send_keys(resume)
-                    except Exception as e:
-                        log.error(e)
-                        log.error("Resume upload failed")
-                        log.debug("Resume: " + resume)
-                        log.debug("Resume Locator: " + str(resume_locator))
-                # Upload cover letter if possible
-                if is_present(upload_cv_locator):
-                    cv = self.uploads["Cover Letter"]
-                    cv_locator = self.browser.find_element(
-                        By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-cover-letter')]")
-                    cv_locator.send_keys(cv)
-
-                    # time.sleep(random.uniform(4.5, 6.5))
-                elif len(self.get_elements("follow")) > 0:
-                    elements = self.get_elements("follow")
-                    for element in elements:
-                        button = self.wait.until(
-                            EC.element_to_be_clickable(element))
-                        button.click()
-
-                if len(self.get_elements("submit")) > 0:
-                    elements = self.get_elements("submit")
-                    for element in elements:
-                        button = self.wait.until(
-                            EC.element_to_be_clickable(element))
-                        button.click()
+            for _ in range(self.MAX_FORM_STEPS):
+                with self.metrics.span("send_resume_step") as step:
+                    # after a click, waits for the next step instead of seeing the old one again
+                    state = modal_state(self.readiness, self.STEP_TIMEOUT, previous)
+                    step.outcome = state["state"]
+                    if self.recorder is not None:
+                        self.recorder.form_step(self.browser, self.current_job)
+
+                    if state["state"] == "success":
                         log.info("Application Submitted")
                         submitted = True
                         break
-
-                elif len(self.get_elements("error")) > 0:
-                    elements = self.get_elements("error")
-                    if "application was sent" in self.browser.page_source:
+                    if state["state"] == "closed" and submitting:
+                        # submitted from a step that showed errors, and the modal went away
                         log.info("Application Submitted")
                         submitted = True
                         break
-                    elif len(elements) > 0:
-                        while len(elements) > 0:
-                            log.info(
-                                "Please answer the questions, waiting 5 seconds...")
-                            time.sleep(5)
-                            elements = self.get_elements("error")
-
-                            for element in elements:
-                                self.process_questions()
-
-                            if "application was sent" in self.browser.page_source:
-                                log.info("Application Submitted")
-                                submitted = True
-                                break
-                            elif is_present(self.locator["easy_apply_button"]):
-                                log.info("Skipping application")
-                                submitted = False
-                                break
-                        continue
-                        # add explicit wait
+                    if state["state"] in ("closed", "timeout"):
+                        log.info("Application not submitted, modal is %s", state['state'])
+                        break
 
+                    # Upload resume / cover letter, once per application
+                    for key, upload in (("resume", "Resume"), ("cover_letter", "Cover Letter")):
+                        if state.get(key) is not None and key not in uploaded and upload in self.uploads:
+                            try:
+                                state[key].send_keys(self.uploads[upload])
+                            except Exception as e:
+                                log.error("%s upload failed: %s", upload, e)
+                            uploaded.add(key)
+
+                    if state["state"] == "error":
+                        if retries >= self.MAX_QUESTION_RETRIES:
+                            log.info("Skipping application, questions could not be answered")
+                            break
+                        retries += 1
+                        log.info("Answering the questions of this step")
+                        unanswered = self.process_questions()
+                        if unanswered:
+                            # parked until answered with --answer, the modal is dismissed below
+                            log.info("Deferring application, %s questions need answers", len(unanswered))
+                            self.applied_store.defer(self.current_job, unanswered)
+                            self.deferred = True
+                            break
                     else:
-                        log.info("Application not submitted")
-                        time.sleep(2)
+                        retries = 0
+
+                    if state["state"] == "submit" and state.get("follow") is not None and not followed:
+                        state["follow"].click()
+                        followed = True
+
+                    if state.get("button") is None:
                         break
-                    # self.process_questions()
-
-                elif len(self.get_elements("next")) > 0:
-                    elements = self.get_elements("next")
-                    for element in elements:
-                        button = self.wait.until(
-                            EC.element_to_be_clickable(element))
-                        button.click()
-
-                elif len(self.get_elements("review")) > 0:
-                    elements = self.get_elements("review")
-                    for element in elements:
-                        button = self.wait.until(
-                            EC.element_to_be_clickable(element))
-                        button.click()
-
-                elif len(self.get_elements("follow")) > 0:
-                    elements = self.get_elements("follow")
-                    for element in elements:
-                        button = self.wait.until(
-                            EC.element_to_be_clickable(element))
-                        button.click()
+                    # a step with errors may carry the submit button too
+                    if state.get("action") == "submit":
+                        self.pace("submit")
+                    try:
+                        state["button"].click()
+                    except StaleElementReferenceException:
+                        # the step re-rendered under us, classify it again
+                        log.debug("Easy Apply step changed before its button was clicked")
+                        previous = None
+                        submitting = False
+                        continue
+                    if state["state"] == "submit":
+                        log.info("Application Submitted")
+                        submitted = True
+                        break
+                    previous = state["step"]
+                    submitting = state.get("action") == "submit"
+            else:
+                log.info("Application not submitted after %s steps", self.MAX_FORM_STEPS)
 
         except Exception as e:
             log.error(e)
             log.error("cannot apply to this job")
-            pass
-            # raise (e)
 
+        if not submitted:
+            dismiss_modal(self.browser)
         return submitted
 
-    def process_questions(self):
-        time.sleep(1)
-        form_fields = self.browser.find_elements(
-            By.CLASS_NAME, "jobs-easy-apply-form-section__grouping")
+    @timed("process_questions")
+    def process_questions(self) -> list:
+        # every grouping's label, input type, ids and options in one script call. Returns
+        # the questions left without an answer, the step is only filled in without any.
+        form_fields = snapshot_form(self.browser)
+        fills = []
+        unanswered = []
 
         for field in form_fields:
             try:
                 # Get the question text and clean it
-                question_element = field.find_element(By.TAG_NAME, "label")
-                question = question_element.text.strip().lower()
+                question = field["label"].strip().lower()
                 if not question:  # Skip empty fields
                     continue
 
-                log.info(f"Found question: {question}")
+                log.debug("Found question: %s", question)
 
-                # Check if we have an existing answer
-                answer = None
-                for stored_question, stored_answer in self.answers.items():
-                    # Use partial matching to handle slight variations in questions
-                    if stored_question and stored_question.lower() in question:
-                        answer = stored_answer
-                        log.info(f"Found stored answer for question: {
-                                 question} -> {answer}")
-                        break
+                # Check if we have an existing answer, stored questions are partially
+                # matched to handle slight variations in questions
+                answer = self.matcher.stored(question)
+                if answer is not None:
+                    log.debug("Found stored answer for question: %s -> %s", question, answer)
 
                 # If no stored answer found, get a new one
                 if answer is None:
                     answer = self.ans_question(question)
-                    log.info(f"Generated new answer for question: {
-                             question} -> {answer}")
-
-                # Now handle different input types based on field inspection
-                field_html = field.get_attribute("outerHTML")
-
-                # Radio buttons
-                if 'type="radio"' in field_html:
-                    radio_inputs = field.find_elements(
-                        By.CSS_SELECTOR, "input[type='radio']")
-                    for radio in radio_inputs:
-                        try:
-                            label = self.browser.find_element(
-                                By.CSS_SELECTOR, f"label[for='{radio.get_attribute('id')}']")
-                            if str(answer).lower() in label.text.lower():
-                                self.browser.execute_script(
-                                    "arguments[0].click();", radio)
-                                log.info(f"Clicked radio button: {label.text}")
-                                break
-                        except Exception as e:
-                            log.error(f"Error with radio button: {str(e)}")
-
-                # Dropdowns
-                elif 'select' in field_html:
-                    try:
-                        select_element = field.find_element(
-                            By.TAG_NAME, "select")
-                        options = select_element.find_elements(
-                            By.TAG_NAME, "option")
-                        for option in options:
-                            if str(answer).lower() in option.text.lower():
-                                option.click()
-                                log.info(f"Selected dropdown option: {
-                                         option.text}")
-                                break
-                    except Exception as e:
-                        log.error(f"Error with dropdown: {str(e)}")
+                    if answer is None:
+                        unanswered.append(question)
+                        continue
+                    log.info("Generated new answer for question: %s -> %s", question, answer)
 
-                # Textboxes
+                # Radio buttons and dropdowns pick the first option containing the answer,
+                # textboxes take the answer as is
+                fill = plan_fill(field, answer)
+                if fill is None:
+                    log.error("No %s option matches answer: %s", field['type'], answer)
                 else:
-                    try:
-                        input_field = field.find_element(By.TAG_NAME, "input")
-                        input_field.clear()
-                        input_field.send_keys(str(answer))
-                        log.info(f"Filled text input with: {answer}")
-                    except Exception as e:
-                        log.error(f"Error with text input: {str(e)}")
+                    fills.append(fill)
+                    log.debug("Filling %s field with: %s", field['type'], fill['text'])
 
-                # Save to answers dictionary and CSV right after successful input
+                # Save to answers dictionary and CSV
                 if question not in self.answers:
                     self.answers[question] = answer
+                    self.matcher.add(question, answer)
                     try:
-                        new_data = pd.DataFrame(
-                            {"Question": [question], "Answer": [answer]})
-                        if os.path.exists(self.qa_file):
-                            new_data.to_csv(
-                                self.qa_file, mode='a', header=False, index=False, encoding='utf-8')
-                        else:
-                            new_data.to_csv(
-                                self.qa_file, index=False, encoding='utf-8')
-                        log.info(f"Saved new QA pair to file: {
-                                 question} -> {answer}")
+                        self.qa_writer.write([question, answer])
+                        log.info("Saved new QA pair to file: %s -> %s", question, answer)
                     except Exception as e:
-                        log.error(f"Error saving to QA file: {str(e)}")
+                        log.error("Error saving to QA file: %s", e)
 
             except Exception as e:
-                log.error(f"Error processing field: {str(e)}")
+                log.error("Error processing field: %s", e)
                 continue
 
+        if unanswered:
+            return unanswered
+        # all fields of the step filled in a single batch
+        fill_form(self.browser, fills)
+        return []
+
+    def answer_patterns(self) -> list:
+        # Patterns for common questions, earlier entries take priority
+        return [
+            (r'experience|years', "4 years"),
+            (r'sponsor|visa', "No"),
+            (r'salary|compensation|pay', self.salary),
+            (r'rate|hourly', self.rate),
+            (r'do you|have you|can you|are you|willing|available|eligible|able to', "Yes"),
+            (r'uk citizen|us citizen|authorized|legal|right to work', "Yes"),
+            (r'gender', "Male"),
+            (r'race|lgbtq|ethnicity|nationality|veteran|diversity', "Prefer not to say"),
+            (r'govt|government|clearance', "No"),
+            (r'phone|mobile|contact', self.phone_number),
+            (r'first name', "Aakash"),
+            (r'last name', "Priyadarshi"),
+            (r'full name|name', "Aakash Priyadarshi"),
+            (r'notice period|notice', "4 weeks"),
+            (r'remote|work from home', "Yes"),
+            (r'linkedin', "https://www.linkedin.com/in/aakash-priyadarshi"),
+            (r'website|portfolio', "https://github.com/aakash"),
+            (r'commute|relocate|travel', "Yes"),
+            (r'education|degree|qualification', "Bachelor's in Computer Science"),
+            (r'python|javascript|react|node', "Yes, proficient"),
+            (r'language|english', "Fluent")
+        ]
+
     def ans_question(self, question):
-        # First check if we already have an answer stored
         question = question.lower().strip()
 
-        # Define patterns for common questions
-        patterns = {
-            r'experience|years': "4 years",
-            r'sponsor|visa': "No",
-            r'salary|compensation|pay': self.salary,
-            r'rate|hourly': self.rate,
-            r'do you|have you|can you|are you|willing|available|eligible|able to': "Yes",
-            r'uk citizen|us citizen|authorized|legal|right to work': "Yes",
-            r'gender': "Male",
-            r'race|lgbtq|ethnicity|nationality|veteran|diversity': "Prefer not to say",
-            r'govt|government|clearance': "No",
-            r'phone|mobile|contact': self.phone_number,
-            r'first name': "Aakash",
-            r'last name': "Priyadarshi",
-            r'full name|name': "Aakash Priyadarshi",
-            r'notice period|notice': "4 weeks",
-            r'remote|work from home': "Yes",
-            r'linkedin': "https://www.linkedin.com/in/aakash-priyadarshi",
-            r'website|portfolio': "https://github.com/aakash",
-            r'commute|relocate|travel': "Yes",
-            r'education|degree|qualification': "Bachelor's in Computer Science",
-            r'python|javascript|react|node': "Yes, proficient",
-            r'language|english': "Fluent"
-        }
-
-        # Try to match the question with patterns
-        for pattern, ans in patterns.items():
-            if re.search(pattern, question):
-                log.info(f"Found pattern match: {pattern} -> {ans}")
-                return ans
+        # Try to match the question with the precompiled patterns
+        match = self.matcher.builtin(question)
+        if match is not None:
+            pattern, ans = match
+            log.info("Found pattern match: %s -> %s", pattern, ans)
+            return ans
 
-        # If no pattern matched, ask for input
-        log.info(f"No automatic answer for: {question}")
+        # If no pattern matched, ask for input, unless it is deferred to --answer
+        log.info("No automatic answer for: %s", question)
+        if self.unknown_questions == "defer":
+            return None
         answer = input(f"Please provide answer for: {question}\n")
 
         return answer
 
-    def load_page(self, sleep=1):
-        scroll_page = 0
-        while scroll_page < 4000:
-            self.browser.execute_script(
-                "window.scrollTo(0," + str(scroll_page) + " );")
-            scroll_page += 500
-            time.sleep(sleep)
-
-        if sleep != 1:
-            self.browser.execute_script("window.scrollTo(0,0);")
-            time.sleep(sleep)
-
-        page = BeautifulSoup(self.browser.page_source, "lxml")
-        return page
+    def load_page(self, ready=None):
+        # wait for the given readiness condition (document.readyState by default), its
+        # result is kept in self.page_state
+        if ready is None:
+            ready = self.readiness.document_ready
+        self.page_state = ready()
+        self.page_signal = self.governor.inspect(self.browser)
+        if self.blocker is not None:
+            self.blocker.collect(self.browser)
+
+        # the page source is only transferred and parsed if the soup is actually used
+        return LazySoup(self.browser)
+
+    def pace(self, kind: str) -> None:
+        # every navigation and submission waits for the rate governor
+        waited = self.governor.wait(kind)
+        if waited > 0:
+            self.metrics.observe("governor_wait", waited, kind)
 
     def avoid_lock(self) -> None:
+        import pyautogui
         x, _ = pyautogui.position()
         pyautogui.moveTo(x + 200, pyautogui.position().y, duration=1.0)
         pyautogui.moveTo(x, pyautogui.position().y, duration=0.5)
@@ -732,26 +923,107 @@ class EasyApplyBot:
         time.sleep(0.5)
         pyautogui.press('esc')
 
+    def search_url(self, position, location, start, experience_level=None) -> str:
+        if experience_level is None:
+            experience_level = self.experience_level
+        # URL for jobs page
+        return self.base_url + search_path(position, location, start, experience_level)
+
+    @timed("search_load")
     def next_jobs_page(self, position, location, jobs_per_page, experience_level=[]):
-        # Construct the experience level part of the URL
-        experience_level_str = ",".join(
-            map(str, experience_level)) if experience_level else ""
-        experience_level_param = f"&f_E={
-            experience_level_str}" if experience_level_str else ""
-        self.browser.get(
-            # URL for jobs page
-            "https://www.linkedin.com/jobs/search/?f_LF=f_AL&keywords=" +
-            position + location + "&start=" + str(jobs_per_page) + experience_level_param)
+        self.pace("navigate")
+        self.lifecycle.navigated()
+        self.browser.get(self.search_url(position, location, jobs_per_page, experience_level))
         # self.avoid_lock()
         log.info("Loading next job page?")
-        self.load_page()
+        self.load_page(self.readiness.search_results)
+        if jobs_per_page == 0 and self.page_state == 0 and self.page_signal is None:
+            # a first result page that loaded without a single card, and without
+            # LinkedIn's no results banner (-1), is how soft rate limits show. A page
+            # inspect() already flagged is not counted twice, a timeout (None) is no sign.
+            self.governor.throttled("empty results")
+        if self.recorder is not None:
+            self.recorder.page(self.browser)
         return (self.browser, jobs_per_page)
 
     # def finish_apply(self) -> None:
     #     self.browser.close()
 
 
+def output_file(parameters: dict) -> str:
+    output_filename: list = [f for f in parameters.get(
+        'output_filename', ['output.csv']) if f is not None]
+    return output_filename[0] if len(output_filename) > 0 else 'output.csv'
+
+
+def applied_db_path(parameters: dict) -> str:
+    # the applied jobs index, next to the output file unless configured otherwise
+    return parameters.get('applied_db') or os.path.splitext(output_file(parameters))[0] + ".db"
+
+
+def bot_from_config(parameters: dict, bot_class: type = EasyApplyBot,
+                    governor_state=None) -> EasyApplyBot:
+    output_filename: str = output_file(parameters)
+    blacklist = parameters.get('blacklist', [])
+    blackListTitles = parameters.get('blackListTitles', [])
+
+    uploads = {} if parameters.get(
+        'uploads', {}) is None else parameters.get('uploads', {})
+    for key in uploads.keys():
+        assert uploads[key] is not None
+
+    return bot_class(parameters['username'],
+                     parameters['password'],
+                     parameters['phone_number'],
+                     parameters['salary'],
+                     parameters['rate'],
+                     uploads=uploads,
+                     filename=output_filename,
+                     blacklist=blacklist,
+                     blackListTitles=blackListTitles,
+                     rules=parameters.get('rules'),
+                     experience_level=parameters.get('experience_level', []),
+                     applied_db=parameters.get('applied_db'),
+                     retention_days=parameters.get('retention_days', 2),
+                     pipeline=parameters.get('pipeline', False),
+                     pipeline_queue=parameters.get('pipeline_queue', 50),
+                     session_file=parameters.get('session_file', 'session.json'),
+                     metrics_json=parameters.get('metrics_json', 'metrics.json'),
+                     metrics_prom=parameters.get('metrics_prom', 'metrics.prom'),
+                     metrics_interval=parameters.get('metrics_interval', 30),
+                     base_url=parameters.get('base_url') or 'https://www.linkedin.com',
+                     record_dir=parameters.get('record_dir'),
+                     headless=parameters.get('headless', False),
+                     block_resources=parameters.get('block_resources', False),
+                     blocked_urls=parameters.get('blocked_urls'),
+                     flush_rows=parameters.get('flush_rows', 20),
+                     flush_seconds=parameters.get('flush_seconds', 5),
+                     durability=parameters.get('durability', 'flush'),
+                     max_pages=parameters.get('max_pages', 40),
+                     max_search_minutes=parameters.get('max_search_minutes'),
+                     combo_weights=parameters.get('combo_weights'),
+                     combo_exclude=parameters.get('combo_exclude'),
+                     prescreen=parameters.get('prescreen', True),
+                     prescreen_concurrency=parameters.get('prescreen_concurrency', 8),
+                     navigations_per_minute=parameters.get('navigations_per_minute', 30),
+                     submissions_per_minute=parameters.get('submissions_per_minute', 6),
+                     rate_burst=parameters.get('rate_burst', 3),
+                     api_requests_per_minute=parameters.get('api_requests_per_minute', 120),
+                     governor_state=governor_state,
+                     checkpoint_file=parameters.get('checkpoint_file', 'checkpoint.json'),
+                     unknown_questions=parameters.get('unknown_questions', 'defer'),
+                     recycle_rss_mb=parameters.get('recycle_rss_mb', 1500),
+                     recycle_navigations=parameters.get('recycle_navigations', 300)
+                     )
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="LinkedIn Easy Apply bot")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its checkpoint")
+    parser.add_argument("--answer", action="store_true",
+                        help="answer the questions deferred jobs wait on, requeue them and exit")
+    args = parser.parse_args()
 
     with open("config.yaml", 'r') as stream:
         try:
@@ -759,6 +1031,14 @@ if __name__ == '__main__':
         except yaml.YAMLError as exc:
             raise exc
 
+    setupLogger(parameters)
+
+    if args.answer:
+        store = AppliedJobStore(applied_db_path(parameters), parameters.get('retention_days', 2))
+        answer_deferred(store, os.path.abspath("qa.csv"))
+        store.close()
+        raise SystemExit(0)
+
     assert len(parameters['positions']) > 0
     assert len(parameters['locations']) > 0
     assert parameters['username'] is not None
@@ -770,33 +1050,36 @@ if __name__ == '__main__':
                         " while should be dict. Try removing '-' from line containing" +
                         " filename & path")
 
-    log.info({k: parameters[k] for k in parameters.keys()
-             if k not in ['username', 'password']})
-
-    output_filename: list = [f for f in parameters.get(
-        'output_filename', ['output.csv']) if f is not None]
-    output_filename: list = output_filename[0] if len(
-        output_filename) > 0 else 'output.csv'
-    blacklist = parameters.get('blacklist', [])
-    blackListTitles = parameters.get('blackListTitles', [])
-
-    uploads = {} if parameters.get(
-        'uploads', {}) is None else parameters.get('uploads', {})
-    for key in uploads.keys():
-        assert uploads[key] is not None
+    log.info("Configuration: %s", {k: parameters[k] for k in parameters.keys()
+                                   if k not in ['username', 'password']})
 
     locations: list = [l for l in parameters['locations'] if l is not None]
     positions: list = [p for p in parameters['positions'] if p is not None]
 
-    bot = EasyApplyBot(parameters['username'],
-                       parameters['password'],
-                       parameters['phone_number'],
-                       parameters['salary'],
-                       parameters['rate'],
-                       uploads=uploads,
-                       filename=output_filename,
-                       blacklist=blacklist,
-                       blackListTitles=blackListTitles,
-                       experience_level=parameters.get('experience_level', [])
-                       )
-    bot.start_apply(positions, locations)
+    checkpoint_file = parameters.get('checkpoint_file', 'checkpoint.json')
+    plan = None
+    if args.resume:
+        plan = load_plan(checkpoint_file) if checkpoint_file else None
+        if plan is None:
+            log.info("No checkpoint to resume from, starting a new run")
+
+    workers: int = parameters.get('workers') or 1
+    if workers > 1:
+        if plan is None:
+            combos = [(p, l, 0) for p, l in ComboScheduler(positions, locations, output_file(parameters),
+                                                            weights=parameters.get('combo_weights'),
+                                                            exclude=parameters.get('combo_exclude'))]
+            jobIDs = []
+        else:
+            combos, jobIDs = plan["combos"], plan["jobIDs"]
+        # jobs whose deferred questions have been answered since
+        store = AppliedJobStore(applied_db_path(parameters), parameters.get('retention_days', 2))
+        jobIDs += [jobID for jobID in store.requeued() if jobID not in jobIDs]
+        store.close()
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.reset(combos)
+        if run_pool(parameters, combos, workers, jobIDs):
+            checkpoint.clear()
+    else:
+        bot = bot_from_config(parameters)
+        bot.start_apply(positions, locations, plan=plan)
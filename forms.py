@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+# Every grouping of the current Easy Apply step in one round trip:
+# [{index, label, type, ids, options: [{id, value, text}], value}, ...]
+FORM_SNAPSHOT_JS = """
+var groups = document.querySelectorAll('.jobs-easy-apply-form-section__grouping');
+var out = [];
+for (var i = 0; i < groups.length; i++) {
+    var group = groups[i];
+    var label = group.querySelector('label');
+    var field = {index: i, label: label ? label.innerText.trim() : '', type: 'none',
+                 ids: [], options: [], value: ''};
+    var radios = group.querySelectorAll("input[type='radio']");
+    var select = group.querySelector('select');
+    var input = group.querySelector('input, textarea');
+    if (radios.length) {
+        field.type = 'radio';
+        for (var r = 0; r < radios.length; r++) {
+            var radio = radios[r];
+            var radioLabel = radio.id ? document.querySelector("label[for='" + radio.id + "']") : null;
+            field.ids.push(radio.id);
+            field.options.push({id: radio.id, value: radio.value,
+                                text: radioLabel ? radioLabel.innerText.trim() : radio.value});
+            if (radio.checked) { field.value = radio.value; }
+        }
+    } else if (select) {
+        field.type = 'select';
+        field.ids.push(select.id);
+        for (var o = 0; o < select.options.length; o++) {
+            var option = select.options[o];
+            field.options.push({id: select.id, value: option.value, text: option.text.trim()});
+        }
+        field.value = select.value;
+    } else if (input) {
+        field.type = input.tagName.toLowerCase() === 'textarea' ? 'textarea' : 'text';
+        field.ids.push(input.id);
+        field.value = input.value;
+    }
+    out.push(field);
+}
+return out;
+"""
+
+# Applies a batch of [{index, type, id, value}] and reports what happened per field.
+# Values go through the native setter plus input/change events, otherwise the
+# page's own form state never sees them.
+FORM_FILL_JS = """
+var fills = arguments[0];
+var groups = document.querySelectorAll('.jobs-easy-apply-form-section__grouping');
+var results = [];
+function setValue(el, value) {
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+              : el.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+for (var i = 0; i < fills.length; i++) {
+    var fill = fills[i];
+    var group = groups[fill.index];
+    try {
+        if (!group) { throw new Error('grouping ' + fill.index + ' is gone'); }
+        if (fill.type === 'radio') {
+            var radio = fill.id ? document.getElementById(fill.id) : null;
+            if (!radio) { throw new Error('radio ' + fill.id + ' not found'); }
+            radio.click();
+        } else if (fill.type === 'select') {
+            setValue(group.querySelector('select'), fill.value);
+        } else {
+            var input = group.querySelector('input, textarea');
+            if (!input) { throw new Error('no input'); }
+            setValue(input, fill.value);
+        }
+        results.push({index: fill.index, ok: true});
+    } catch (e) {
+        results.push({index: fill.index, ok: false, error: String(e.message || e)});
+    }
+}
+return results;
+"""
+
+
+def snapshot_form(browser) -> list:
+    return browser.execute_script(FORM_SNAPSHOT_JS) or []
+
+
+def plan_fill(field: dict, answer) -> dict | None:
+    # turns a resolved answer into a fill instruction for FORM_FILL_JS, options are
+    # picked by the answer being contained in their text, first match wins
+    wanted = str(answer).lower()
+    if field["type"] in ("radio", "select"):
+        for option in field["options"]:
+            if wanted in option["text"].lower():
+                return {"index": field["index"], "type": field["type"],
+                        "id": option["id"], "value": option["value"], "text": option["text"]}
+        return None
+    if field["type"] in ("text", "textarea"):
+        return {"index": field["index"], "type": field["type"],
+                "id": field["ids"][0] if field["ids"] else "", "value": str(answer), "text": str(answer)}
+    return None
+
+
+def fill_form(browser, fills: list) -> list:
+    if not fills:
+        return []
+    results = browser.execute_script(FORM_FILL_JS, fills) or []
+    for result in results:
+        if not result.get("ok"):
+            log.error("Error filling field %s: %s", result['index'], result.get('error'))
+    return results
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Pages LinkedIn serves instead of the one asked for when it thinks we go too fast
+THROTTLE_URLS = ("/checkpoint/", "/authwall", "/uas/login")
+THROTTLE_TITLE_RE = re.compile(
+    r"security (check|verification)|too many requests|\b429\b|unusual activity|"
+    r"let.s do a quick", re.IGNORECASE)
+
+# url and title in a single round trip
+PAGE_SIGNAL_JS = "return [location.href, document.title];"
+
+# slots of the shared state array
+NAVIGATE, SUBMIT, SLOWDOWN, STRIKES, CLEAN, PAUSED_UNTIL, API = range(7)
+INITIAL_STATE = (0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def throttle_reason(url: str, title: str) -> str | None:
+    for part in THROTTLE_URLS:
+        if part in url:
+            return f"redirected to {part}"
+    match = THROTTLE_TITLE_RE.search(title or "")
+    return f"page title '{match.group(0)}'" if match else None
+
+
+class Governor:
+    # Paces navigations, submissions and API requests (the pre-screen) with one token
+    # bucket each, at the configured rate divided by the current slowdown. Throttling
+    # signs (checkpoint or login redirects, rate limit pages, empty first result pages,
+    # 429 and 999 API responses) double the slowdown and pause every session for an
+    # exponentially growing cool-down; a run of clean pages walks the slowdown back
+    # towards 1. The state lives in a small array, which
+    # shared_state() puts in shared memory so every worker process obeys one governor.
+
+    def __init__(self, navigations_per_minute: float = 30, submissions_per_minute: float = 6,
+                 burst: int = 3, backoff: float = 30, max_backoff: float = 15 * 60,
+                 max_slowdown: float = 16, ramp_after: int = 10, state=None,
+                 api_requests_per_minute: float = 120) -> None:
+        self.intervals = {"navigate": 60 / navigations_per_minute, "submit": 60 / submissions_per_minute,
+                          "api": 60 / api_requests_per_minute}
+        self.slots = {"navigate": NAVIGATE, "submit": SUBMIT, "api": API}
+        self.burst = max(1, burst)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_slowdown = max_slowdown
+        self.ramp_after = ramp_after
+        if state is None:
+            self.state = list(INITIAL_STATE)
+            self.lock = threading.Lock()
+        else:
+            self.state = state
+            self.lock = state.get_lock()
+        self.signals: dict = {}  # reason -> count, this process only
+
+    @staticmethod
+    def shared_state(ctx):
+        # state array for Governors in several processes, pass it to each of them
+        return ctx.Array("d", INITIAL_STATE)
+
+    @property
+    def slowdown(self) -> float:
+        return self.state[SLOWDOWN]
+
+    def wait(self, kind: str) -> float:
+        # blocks until `kind` (navigate / submit / api) may go ahead, returns the seconds waited
+        with self.lock:
+            now = time.time()
+            interval = self.intervals[kind] * self.state[SLOWDOWN]
+            slot = self.slots[kind]
+            # the bucket refills while idle, but never beyond `burst` tokens
+            start = max(self.state[slot], now - (self.burst - 1) * interval, self.state[PAUSED_UNTIL])
+            self.state[slot] = start + interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    def inspect(self, browser) -> str | None:
+        # checks the page the browser landed on, returns the throttle sign if any
+        try:
+            url, title = browser.execute_script(PAGE_SIGNAL_JS)
+        except Exception as e:
+            log.debug("Could not inspect page for throttling: %s", e)
+            return None
+        reason = throttle_reason(url or "", title or "")
+        if reason is None:
+            self.clean()
+        else:
+            self.throttled(reason)
+        return reason
+
+    def clean(self) -> None:
+        with self.lock:
+            self.state[CLEAN] += 1
+            if self.state[CLEAN] >= self.ramp_after and self.state[SLOWDOWN] > 1:
+                self.state[CLEAN] = 0
+                self.state[SLOWDOWN] = max(1.0, self.state[SLOWDOWN] * 0.75)
+                self.state[STRIKES] = max(0.0, self.state[STRIKES] - 1)
+                log.info("Pages are clean again, slowdown eased to %.2fx", self.state[SLOWDOWN])
+
+    def throttled(self, reason: str) -> None:
+        with self.lock:
+            self.state[CLEAN] = 0
+            self.state[STRIKES] += 1
+            self.state[SLOWDOWN] = min(self.max_slowdown, self.state[SLOWDOWN] * 2)
+            pause = min(self.max_backoff, self.backoff * 2 ** (self.state[STRIKES] - 1))
+            self.state[PAUSED_UNTIL] = max(self.state[PAUSED_UNTIL], time.time() + pause)
+            slowdown = self.state[SLOWDOWN]
+        self.signals[reason] = self.signals.get(reason, 0) + 1
+        log.warning("Throttling suspected (%s), pausing %.0fs and slowing down to %.2fx",
+                    reason, pause, slowdown)
+
+    def summary(self) -> dict:
+        return {"slowdown": round(self.slowdown, 2), "signals": dict(self.signals)}
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+
+# jobID -> (outcome, timestamp) index kept in SQLite, with an in-memory set in
+# front of it so membership checks never touch the disk
+class AppliedJobStore:
+    # an in_progress claim older than this is considered abandoned by a dead worker
+    CLAIM_TIMEOUT = 60 * 60
+
+    def __init__(self, path: str, retention_days: float | None = 2) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        # autocommit, every write is a single statement
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS jobs ("
+                          "job_id TEXT PRIMARY KEY, outcome TEXT NOT NULL, ts REAL NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta ("
+                          "key TEXT PRIMARY KEY, value TEXT)")
+        # questions a deferred job is waiting on, see defer()
+        self.conn.execute("CREATE TABLE IF NOT EXISTS questions ("
+                          "job_id TEXT NOT NULL, question TEXT NOT NULL, ts REAL NOT NULL, "
+                          "PRIMARY KEY (job_id, question))")
+        self.prune()
+        self.ids: set = {row[0] for row in self.conn.execute("SELECT job_id FROM jobs")}
+        log.info("%s jobIDs found in %s", len(self.ids), path)
+
+    def cutoff(self) -> float:
+        if not self.retention_days:
+            return 0.0
+        return time.time() - self.retention_days * 24 * 60 * 60
+
+    def prune(self) -> None:
+        # jobs waiting on answers are kept until they are applied to
+        self.conn.execute("DELETE FROM jobs WHERE ts < ? AND outcome NOT IN ('deferred', 'requeued')",
+                          (self.cutoff(),))
+
+    def import_csv(self, filename: str) -> int:
+        # one-off migration of an existing out.csv, streamed with the csv module
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'imported_csv'").fetchone():
+            return 0
+        count = 0
+        if os.path.isfile(filename):
+            cutoff = self.cutoff()
+            rows = []
+            with open(filename, newline='', encoding='utf-8', errors='replace') as f:
+                for row in csv.reader(f):
+                    if len(row) < 6:
+                        continue
+                    try:
+                        ts = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S").timestamp()
+                    except ValueError:
+                        continue
+                    if ts < cutoff:
+                        continue
+                    outcome = "applied" if row[5] == "True" else "failed"
+                    rows.append((row[1], outcome, ts))
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO jobs (job_id, outcome, ts) VALUES (?, ?, ?)", rows)
+            self.ids.update(r[0] for r in rows)
+            count = len(rows)
+            log.info("Imported %s jobIDs from %s", count, filename)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_csv', ?)", (filename,))
+        return count
+
+    def add(self, jobID, outcome: str) -> None:
+        jobID = str(jobID)
+        self.conn.execute("INSERT OR REPLACE INTO jobs (job_id, outcome, ts) VALUES (?, ?, ?)",
+                          (jobID, outcome, time.time()))
+        self.ids.add(jobID)
+
+    def claim(self, jobID) -> bool:
+        # atomically reserve a job across every process sharing the database, the
+        # claim is turned into a final outcome by add(). Taking over an abandoned or
+        # requeued job makes it in_progress, so nobody else can take it too.
+        jobID = str(jobID)
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT INTO jobs (job_id, outcome, ts) VALUES (?, 'in_progress', ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET outcome = 'in_progress', ts = excluded.ts "
+            "WHERE (outcome = 'in_progress' AND ts < ?) OR outcome = 'requeued'",
+            (jobID, now, now - self.CLAIM_TIMEOUT))
+        self.ids.add(jobID)
+        return cursor.rowcount == 1
+
+    def release(self, jobID) -> None:
+        # drops a claim that never got an outcome, left behind by an interrupted run
+        jobID = str(jobID)
+        cursor = self.conn.execute("DELETE FROM jobs WHERE job_id = ? AND outcome = 'in_progress'",
+                                   (jobID,))
+        if cursor.rowcount:
+            self.ids.discard(jobID)
+
+    def defer(self, jobID, questions: list) -> None:
+        # parks a job until its questions are answered, the job itself is recorded
+        # with the 'deferred' outcome by add()
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO questions (job_id, question, ts) VALUES (?, ?, ?)",
+            [(str(jobID), question, now) for question in questions])
+
+    def deferred_questions(self) -> dict:
+        # {question: [jobIDs]}, oldest question first
+        questions: dict = {}
+        for jobID, question in self.conn.execute(
+                "SELECT q.job_id, q.question FROM questions q JOIN jobs j ON j.job_id = q.job_id "
+                "WHERE j.outcome = 'deferred' ORDER BY q.ts"):
+            questions.setdefault(question, []).append(jobID)
+        return questions
+
+    def answered(self, questions: list) -> list:
+        # drops answered questions, deferred jobs with none left become 'requeued' and
+        # are returned
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("DELETE FROM questions WHERE question = ?",
+                                  [(q,) for q in questions])
+            ready = [row[0] for row in self.conn.execute(
+                "SELECT job_id FROM jobs WHERE outcome = 'deferred' "
+                "AND job_id NOT IN (SELECT job_id FROM questions)")]
+            self.conn.executemany("UPDATE jobs SET outcome = 'requeued', ts = ? WHERE job_id = ?",
+                                  [(time.time(), jobID) for jobID in ready])
+        return ready
+
+    def requeued(self) -> list:
+        # jobs to apply to again now that their questions have answers
+        return [row[0] for row in self.conn.execute(
+            "SELECT job_id FROM jobs WHERE outcome = 'requeued' ORDER BY ts")]
+
+    def outcome(self, jobID) -> str | None:
+        row = self.conn.execute("SELECT outcome FROM jobs WHERE job_id = ?",
+                                (str(jobID),)).fetchone()
+        return row[0] if row else None
+
+    def __contains__(self, jobID) -> bool:
+        return str(jobID) in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def close(self) -> None:
+        self.conn.close()
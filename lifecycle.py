@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+
+try:
+    import psutil
+except ImportError:  # optional, /proc is read instead on Linux
+    psutil = None
+
+log = logging.getLogger(__name__)
+
+
+def process_tree(pid: int) -> list:
+    # the pid and all its descendants, from psutil or /proc. Just the pid where
+    # neither is available.
+    if psutil is not None:
+        try:
+            return [pid] + [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return [pid]
+    if not os.path.isdir("/proc"):
+        return [pid]
+    children: dict = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                # the command name may contain spaces, the fields after it do not
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree = []
+    todo = [pid]
+    while todo:
+        current = todo.pop()
+        tree.append(current)
+        todo.extend(children.get(current, []))
+    return tree
+
+
+def rss(pid: int) -> int | None:
+    # resident bytes of one process, None when it cannot be read
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class BrowserLifecycle:
+    # Watches the WebDriver session: navigations since it started, resident memory of
+    # chromedriver and every Chrome process under it, and whether it still answers.
+    # due() says when the browser should be recycled, alive() when it has to be
+    # replaced because the driver died or hangs. Thresholds of 0 are disabled.
+
+    def __init__(self, max_rss_mb: float = 1500, max_navigations: int = 300,
+                 health_timeout: float = 30) -> None:
+        self.max_rss_mb = max_rss_mb
+        self.max_navigations = max_navigations
+        self.health_timeout = health_timeout
+        self.browser = None
+        self.navigations = 0
+        self.peak_rss_mb = 0.0
+        self.recycles = 0
+        self.restarts = 0
+
+    def attach(self, browser) -> None:
+        self.browser = browser
+        self.navigations = 0
+
+    def navigated(self) -> None:
+        self.navigations += 1
+
+    def rss_mb(self) -> float | None:
+        try:
+            pid = self.browser.service.process.pid
+        except AttributeError:
+            return None
+        sizes = [size for size in map(rss, process_tree(pid)) if size is not None]
+        if not sizes:
+            return None
+        mb = sum(sizes) / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, mb)
+        return mb
+
+    def due(self) -> str | None:
+        # why the browser should be recycled now, None while it is fine
+        if self.max_navigations and self.navigations >= self.max_navigations:
+            return f"{self.navigations} navigations"
+        if self.max_rss_mb:
+            mb = self.rss_mb()
+            if mb is not None and mb >= self.max_rss_mb:
+                return f"{mb:.0f} MB resident"
+        return None
+
+    def alive(self) -> bool:
+        # a trivial script has to come back within health_timeout. It runs in its own
+        # thread, a hung driver would otherwise block us for its full HTTP timeout.
+        try:
+            if self.browser.service.process.poll() is not None:
+                return False
+        except AttributeError:
+            pass
+        result: dict = {}
+
+        def probe():
+            try:
+                result["ok"] = self.browser.execute_script("return 1;") == 1
+            except Exception as e:
+                log.debug("Browser health check failed: %s", e)
+                result["ok"] = False
+
+        thread = threading.Thread(target=probe, daemon=True, name="browser health")
+        thread.start()
+        thread.join(self.health_timeout)
+        return result.get("ok", False)
+
+    def kill(self) -> None:
+        # quit() talks to the driver, which may be exactly what is broken, so
+        # chromedriver and the Chrome processes under it are killed directly
+        try:
+            pid = self.browser.service.process.pid
+        except AttributeError:
+            return
+        for child in reversed(process_tree(pid)):
+            try:
+                os.kill(child, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+            except OSError as e:
+                log.debug("Could not kill browser process %s: %s", child, e)
+
+    def summary(self) -> dict:
+        return {"recycles": self.recycles, "restarts": self.restarts,
+                "peak_rss_mb": round(self.peak_rss_mb, 1)}
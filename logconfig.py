@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# job and combo the current thread works on, stamped onto every record
+job_context: contextvars.ContextVar = contextvars.ContextVar("job_context", default={})
+
+
+def set_context(**fields) -> None:
+    # e.g. set_context(jobID=...) or set_context(combo=...), None removes a field
+    context = {**job_context.get(), **fields}
+    job_context.set({k: v for k, v in context.items() if v is not None})
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = job_context.get()
+        record.jobID = context.get("jobID")
+        record.combo = context.get("combo")
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    # Lets a message through at most once per `interval` seconds. Messages are told
+    # apart by logger, level and their formatted text, so "Easy Apply button not
+    # found" repeated for every job is held back while "Applied to %s" is not, its
+    # jobID differs every time. The next one let through says how many were dropped.
+    # Warnings and errors always pass.
+
+    def __init__(self, interval: float = 60) -> None:
+        super().__init__()
+        self.interval = interval
+        self.seen: dict = {}  # key -> [last emitted, suppressed since]
+        self.mutex = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self.mutex:
+            entry = self.seen.get(key)
+            if entry is not None and now - entry[0] < self.interval:
+                entry[1] += 1
+                return False
+            suppressed = entry[1] if entry is not None else 0
+            self.seen[key] = [now, 0]
+            if len(self.seen) > 10000:
+                # one-off messages would otherwise pile up forever
+                self.seen = {k: v for k, v in self.seen.items() if now - v[0] < self.interval}
+        record.suppressed = suppressed
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        if getattr(record, "suppressed", 0):
+            text += f" (and {record.suppressed} more like it)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    # one JSON object per line, with the job and combo the record was logged for
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.processName,
+            "msg": record.getMessage(),
+        }
+        # a traceback is already part of msg, QueueHandler folds it in
+        for field in ("jobID", "combo", "suppressed"):
+            value = getattr(record, field, None)
+            if value:
+                entry[field] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(name: str = "applyJobs", directory: str = "./logs", level: str = "INFO",
+                  json_records: bool = True, max_mb: float = 20, backups: int = 5,
+                  rate_limit: float = 60) -> logging.handlers.QueueListener:
+    # Records are stamped and rate limited on the thread that logs them, the %-args
+    # are interpolated there too (RateLimitFilter and QueueHandler.prepare() both call
+    # getMessage()). A listener thread then takes them off the queue and does the JSON
+    # or text formatting and the file and console I/O. The file rotates at `max_mb`,
+    # keeping `backups` old ones.
+    os.makedirs(directory, exist_ok=True)
+    dt: str = datetime.strftime(datetime.now(), "%m_%d_%y %H_%M_%S ")
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(directory, f"{dt}{name}.log"), maxBytes=int(max_mb * 1024 * 1024),
+        backupCount=backups, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter() if json_records else TextFormatter(
+        "%(asctime)s::%(name)s::%(levelname)s::%(message)s", "%d-%b-%y %H:%M:%S"))
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(TextFormatter("%(asctime)s - %(levelname)s - %(message)s", "%H:%M:%S"))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter(rate_limit))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    listener = logging.handlers.QueueListener(records, file_handler, console_handler,
+                                              respect_handler_level=True)
+    listener.start()
+    # drains the queue before the interpreter goes away
+    atexit.register(listener.stop)
+    return listener
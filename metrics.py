@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# histogram bucket upper bounds in seconds
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+
+class Span:
+    # handed out by Metrics.span(), callers may set the outcome before it closes
+    def __init__(self, phase: str) -> None:
+        self.phase = phase
+        self.outcome = "ok"
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+
+class Metrics:
+    # Per-phase timings: one duration histogram per (phase, outcome), which also gives
+    # the count split by outcome. Exported as a JSON summary at the end of the run
+    # and as a Prometheus text file rewritten at most every `interval` seconds.
+
+    def __init__(self, json_path: str | None = "metrics.json", prom_path: str | None = "metrics.prom",
+                 interval: float = 30) -> None:
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self.interval = interval
+        self.histograms: dict = {}
+        self.mutex = threading.Lock()
+        self.started = time.time()
+        self.last_export = time.time()
+        atexit.register(self.export)
+
+    @contextmanager
+    def span(self, phase: str):
+        span = Span(phase)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.outcome = "error"
+            raise
+        finally:
+            self.observe(phase, time.perf_counter() - start, span.outcome)
+
+    def observe(self, phase: str, seconds: float, outcome: str = "ok") -> None:
+        with self.mutex:
+            key = (phase, str(outcome))
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(seconds)
+            due = self.prom_path and time.time() - self.last_export >= self.interval
+            if due:
+                self.last_export = time.time()
+        if due:
+            self.write_prometheus()
+
+    def summary(self) -> dict:
+        phases: dict = {}
+        with self.mutex:
+            for (phase, outcome), hist in sorted(self.histograms.items()):
+                entry = phases.setdefault(phase, {"count": 0, "seconds": 0.0, "max": 0.0, "outcomes": {}})
+                entry["count"] += hist.count
+                entry["seconds"] += hist.sum
+                entry["max"] = max(entry["max"], hist.max)
+                entry["outcomes"][outcome] = hist.count
+        for entry in phases.values():
+            entry["mean"] = entry["seconds"] / entry["count"] if entry["count"] else 0.0
+            entry["seconds"] = round(entry["seconds"], 3)
+            entry["mean"] = round(entry["mean"], 3)
+            entry["max"] = round(entry["max"], 3)
+        return {"run_seconds": round(time.time() - self.started, 1), "phases": phases}
+
+    def prometheus(self) -> str:
+        lines = ["# HELP easyapplybot_phase_seconds Time spent per bot phase.",
+                 "# TYPE easyapplybot_phase_seconds histogram"]
+        with self.mutex:
+            for (phase, outcome), hist in sorted(self.histograms.items()):
+                labels = f'phase="{phase}",outcome="{outcome}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), hist.buckets):
+                    cumulative += n
+                    lines.append(f'easyapplybot_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"easyapplybot_phase_seconds_sum{{{labels}}} {hist.sum:.6f}")
+                lines.append(f"easyapplybot_phase_seconds_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self) -> None:
+        write_atomic(self.prom_path, self.prometheus())
+
+    def export(self) -> None:
+        try:
+            if self.prom_path:
+                self.write_prometheus()
+            if self.json_path:
+                write_atomic(self.json_path, json.dumps(self.summary(), indent=2))
+        except OSError as e:
+            log.error("Could not export metrics: %s", e)
+
+
+def timed(phase: str, outcome=None):
+    # times a bot method under self.metrics, `outcome` maps its return value to a label
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(phase) as span:
+                result = method(self, *args, **kwargs)
+                if outcome is not None:
+                    span.outcome = outcome(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+# Classifies the Easy Apply modal in a single round trip and hands back the elements
+# the step needs. Returns null while the modal is still rendering, and while it still
+# shows the step `previous` (arguments[0]) was taken from. No modal at all only means
+# 'closed' once one has been seen (arguments[1]), before that it may not be open yet.
+#   state: success | error | submit | review | next | closed
+#   button: the primary button of the step, action: what it does (next / review / submit)
+#   step: state, progress and error count, marked on the button to tell steps apart
+#   resume, cover_letter: file inputs when the step has them
+#   follow: the "follow company" label on the submit step
+MODAL_STATE_JS = """
+var previous = arguments[0], seen = arguments[1];
+if (document.readyState !== 'complete') { return null; }
+var modal = document.querySelector('.jobs-easy-apply-modal, .artdeco-modal[role="dialog"], [role="dialog"]');
+if (!modal) {
+    return seen ? {state: 'closed'} : null;
+}
+var text = modal.textContent || '';
+if (/application was sent|Application sent/i.test(text)) {
+    return {state: 'success'};
+}
+var out = {
+    resume: modal.querySelector("input[id*='jobs-document-upload-file-input-upload-resume']"),
+    cover_letter: modal.querySelector("input[id*='jobs-document-upload-file-input-upload-cover-letter']"),
+    follow: modal.querySelector("label[for='follow-company-checkbox']"),
+    errors: modal.querySelectorAll('.artdeco-inline-feedback__message').length
+};
+var submit = modal.querySelector("button[aria-label='Submit application']");
+var review = modal.querySelector("button[aria-label='Review your application']");
+var next = modal.querySelector("button[aria-label='Continue to next step']");
+if (out.errors > 0) {
+    out.state = 'error';
+    out.button = submit || review || next;
+    out.action = submit ? 'submit' : review ? 'review' : 'next';
+} else if (submit) {
+    out.state = 'submit';
+    out.button = submit;
+    out.action = 'submit';
+} else if (review) {
+    out.state = 'review';
+    out.button = review;
+    out.action = 'review';
+} else if (next) {
+    out.state = 'next';
+    out.button = next;
+    out.action = 'next';
+} else {
+    return null;
+}
+var progress = modal.querySelector('progress, [role="progressbar"]');
+out.step = [out.state, progress ? (progress.getAttribute('aria-valuenow') || progress.value) : '',
+            out.errors].join('|');
+if (out.button) {
+    if (previous && out.step === previous && out.button.getAttribute('data-easyapply-step') === previous) {
+        return null;
+    }
+    out.button.setAttribute('data-easyapply-step', out.step);
+}
+return out;
+"""
+
+# Closes the modal and confirms discarding the draft, used when we give up on a job
+DISMISS_MODAL_JS = """
+var close = document.querySelector('.artdeco-modal__dismiss, button[aria-label="Dismiss"]');
+if (close) { close.click(); }
+var discard = document.querySelector('button[data-control-name="discard_application_confirm_btn"], ' +
+                                     '.artdeco-modal__confirm-dialog-btn');
+if (discard) { discard.click(); }
+return !!close;
+"""
+
+
+def modal_state(readiness, timeout: float, previous: str | None = None, seen: bool = True) -> dict:
+    # waits up to `timeout` for the modal to settle into a known state other than the
+    # step `previous`. A step that did not change is classified anyway at the deadline,
+    # the caller's retry bound deals with it.
+    state = readiness.wait_until(lambda d: d.execute_script(MODAL_STATE_JS, previous, seen), timeout)
+    if not state and previous is not None:
+        state = readiness.wait_until(lambda d: d.execute_script(MODAL_STATE_JS, None, seen), 0)
+    return state if state else {"state": "timeout"}
+
+
+def dismiss_modal(browser) -> bool:
+    try:
+        return bool(browser.execute_script(DISMISS_MODAL_JS))
+    except Exception as e:
+        log.debug("Could not dismiss the Easy Apply modal: %s", e)
+        return False
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+def search_path(position, location, start, experience_level=None) -> str:
+    # path and query of an Easy Apply search, location is passed as "&location=..."
+    experience_level_str = ",".join(map(str, experience_level)) if experience_level else ""
+    experience_level_param = f"&f_E={experience_level_str}" if experience_level_str else ""
+    return ("/jobs/search/?f_LF=f_AL&keywords=" + position + location +
+            "&start=" + str(start) + experience_level_param)
+
+
+class Paginator:
+    # Walks the &start= offset of one (position, location) search. The offset advances
+    # by the number of cards actually shown, and the search ends on the first of:
+    #   - an empty page, or a page shorter than the first one (end of results)
+    #   - a page with no jobID we haven't seen already (LinkedIn repeats the last page)
+    #   - the page or time budget of the combo
+    #   - too many consecutive pages that failed to load
+
+    def __init__(self, max_pages: int = 40, max_seconds: float = 60 * 60, max_errors: int = 3,
+                 start: int = 0) -> None:
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.max_errors = max_errors
+        # non-zero when a search is resumed from a checkpoint
+        self.start = start
+        self.pages = 0
+        self.page_size = 0
+        self.errors = 0
+        self.seen: set = set()
+        self.started = time.time()
+        self.reason: str | None = None
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def remaining(self) -> float:
+        return max(0.0, self.max_seconds - self.elapsed())
+
+    def stop(self, reason: str) -> None:
+        if self.reason is None:
+            self.reason = reason
+            log.info("Search finished after %s pages: %s", self.pages, reason)
+
+    def record(self, cards: list) -> int:
+        # registers a harvested page, returns how many of its jobIDs are new
+        self.pages += 1
+        self.errors = 0
+        ids = {card["jobID"] for card in cards if card.get("jobID")}
+        fresh = len(ids - self.seen)
+        self.seen |= ids
+
+        if not cards:
+            self.stop("end of results")
+        elif fresh == 0:
+            self.stop("no new jobs on page")
+        elif self.page_size and len(cards) < self.page_size:
+            self.stop("last page")
+        self.page_size = max(self.page_size, len(cards))
+        self.start += len(cards)
+        return fresh
+
+    def failed(self) -> None:
+        self.errors += 1
+        if self.errors >= self.max_errors:
+            self.stop(f"{self.errors} pages in a row failed")
+
+    def has_next(self) -> bool:
+        if self.reason is None:
+            if self.pages >= self.max_pages:
+                self.stop("page budget reached")
+            elif self.elapsed() >= self.max_seconds:
+                self.stop("time budget reached")
+        return self.reason is None
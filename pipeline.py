@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+
+from cards import harvest_cards
+from pagination import Paginator
+from readiness import PageReadiness
+
+log = logging.getLogger(__name__)
+
+
+class Harvester(threading.Thread):
+    # producer side of the pipelined mode: walks the search result pages of one combo
+    # in its own browser session and keeps a bounded queue of candidate jobIDs filled
+    # ahead of the applying browser
+
+    def __init__(self, bot, position, location, maxsize: int = 50, start: int = 0) -> None:
+        super().__init__(name="harvester", daemon=True)
+        self.bot = bot
+        self.position = position
+        self.location = location
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.stop_event = threading.Event()
+        self.seen: set = set()
+        # &start= of the first page, `start` itself is Thread.start()
+        self.offset = start
+
+    def put(self, item) -> bool:
+        # blocks while the queue is full, but keeps an eye on stop()
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self) -> None:
+        browser = self.bot.get_harvest_browser()
+        readiness = PageReadiness(browser, timeout=self.bot.PAGE_TIMEOUT)
+        paginator = Paginator(self.bot.max_pages, self.bot.max_search_time, start=self.offset)
+        try:
+            while not self.stop_event.is_set() and paginator.has_next():
+                self.bot.pace("navigate")
+                browser.get(self.bot.search_url(self.position, self.location, paginator.start))
+                count = readiness.search_results()
+                signal = self.bot.governor.inspect(browser)
+                if paginator.start == 0 and count == 0 and signal is None:
+                    # empty without the no results banner, see next_jobs_page()
+                    self.bot.governor.throttled("empty results")
+                if self.bot.blocker is not None:
+                    self.bot.blocker.collect(browser)
+                with self.bot.metrics.span("card_harvest"):
+                    cards = harvest_cards(browser)
+                paginator.record(cards)
+                for jobID in self.bot.filter_cards(cards):
+                    if jobID in self.seen:
+                        continue
+                    self.seen.add(jobID)
+                    if not self.put(jobID):
+                        return
+        except Exception as e:
+            log.error("Harvester stopped: %s", e)
+        finally:
+            # end of results marker for the consumer
+            self.put(None)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+
+def consume(bot, position, location, maxsize: int = 50, start: int = 0) -> None:
+    # consumer side: applies continuously from the harvester's queue, the applying
+    # browser never waits for a search page to load
+    harvester = Harvester(bot, position, location, maxsize, start)
+    harvester.start()
+    start_time: float = time.time()
+    try:
+        while time.time() - start_time < bot.max_search_time:
+            try:
+                jobID = harvester.queue.get(timeout=bot.PAGE_TIMEOUT)
+            except queue.Empty:
+                if not harvester.is_alive():
+                    break
+                continue
+            if jobID is None:
+                break
+            if jobID in bot.applied_store:
+                continue
+            try:
+                bot.apply_loop({jobID: "To be processed"})
+            except Exception as e:
+                # one job must not end the run, the harvester keeps going
+                log.error("Job %s failed: %s", jobID, e)
+                bot.ensure_browser()
+    finally:
+        harvester.stop()
+        harvester.join(timeout=bot.PAGE_TIMEOUT)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import logging
+import queue
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+# job posting endpoint, the same one the job view page loads its details from
+POSTING_PATH = "/voyager/api/jobs/jobPostings/{}"
+
+# applyMethod types that open the Easy Apply modal, anything else links off site
+EASY_APPLY_TYPES = ("ComplexOnsiteApply", "SimpleOnsiteApply")
+
+# how LinkedIn's API says we go too fast, 999 is its own "request denied"
+THROTTLE_STATUSES = (429, 999)
+
+
+def verdict(posting: dict, rules=None) -> str:
+    # eligible | closed | already_applied | no_easy_apply | filtered. Fields that
+    # are missing never rule a job out, the browser gets the final word on it.
+    data = posting.get("data", posting)
+    if data.get("jobState") not in (None, "LISTED"):
+        return "closed"
+    if (data.get("applyingInfo") or {}).get("applied"):
+        return "already_applied"
+    apply_type = (data.get("applyMethod") or {}).get("$type", "")
+    if apply_type and not any(t in apply_type for t in EASY_APPLY_TYPES):
+        return "no_easy_apply"
+    if rules is not None and rules.reject({"title": data.get("title") or ""}):
+        return "filtered"
+    return "eligible"
+
+
+class PreScreen:
+    # Fetches job posting metadata over plain HTTP with the browser's session cookies,
+    # several jobs at a time, so ineligible jobs are dropped before the browser spends
+    # a navigation on them. Connections are kept alive in a pool and reused. Requests
+    # are paced by the rate governor, if given, and report rate limit responses to it.
+    # Any failure yields "unknown", which the caller treats as eligible.
+
+    def __init__(self, base_url: str, rules=None,
+                 concurrency: int = 8, timeout: float = 10, governor=None) -> None:
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.netloc
+        self.rules = rules  # RuleSet judging the posting's title
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.governor = governor
+        self.pool: queue.LifoQueue = queue.LifoQueue()
+        self.headers: dict | None = None  # None until cookies are loaded or after a 401
+        self.counts: dict = {}  # verdict -> jobs
+
+    @property
+    def needs_cookies(self) -> bool:
+        return self.headers is None
+
+    def use_cookies(self, cookies: list) -> None:
+        # cookies as returned by WebDriver's get_cookies()
+        jar = {c["name"]: c["value"] for c in cookies}
+        self.headers = {
+            "Cookie": "; ".join(f"{name}={value}" for name, value in jar.items()),
+            # LinkedIn wants the JSESSIONID value echoed back as csrf-token
+            "csrf-token": jar.get("JSESSIONID", "").strip('"'),
+            "Accept": "application/json",
+            "x-restli-protocol-version": "2.0.0",
+        }
+
+    def connect(self) -> http.client.HTTPConnection:
+        try:
+            return self.pool.get_nowait()
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            return cls(self.host, timeout=self.timeout)
+
+    def fetch(self, jobID) -> dict | None:
+        # the posting as JSON, None when it could not be had. Runs in a worker thread.
+        if self.governor is not None:
+            self.governor.wait("api")
+        conn = self.connect()
+        try:
+            conn.request("GET", POSTING_PATH.format(jobID), headers=self.headers or {})
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            log.debug("Pre-screen of %s failed: %s", jobID, e)
+            return None
+        if response.will_close:
+            conn.close()
+        else:
+            self.pool.put(conn)
+        if response.status in (401, 403) or 300 <= response.status < 400:
+            # logged out or the csrf token changed, reload cookies before the next batch
+            self.headers = None
+            log.debug("Pre-screen of %s was refused with status %s", jobID, response.status)
+            return None
+        if response.status in THROTTLE_STATUSES:
+            if self.governor is not None:
+                self.governor.throttled(f"API status {response.status}")
+            log.debug("Pre-screen of %s was rate limited with status %s", jobID, response.status)
+            return None
+        if response.status != 200:
+            log.debug("Pre-screen of %s returned status %s", jobID, response.status)
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    async def check(self, jobID, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            posting = await asyncio.to_thread(self.fetch, jobID)
+        return "unknown" if posting is None else verdict(posting, self.rules)
+
+    async def check_all(self, jobIDs: list) -> dict:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self.check(jobID, semaphore) for jobID in jobIDs))
+        return dict(zip(jobIDs, results))
+
+    def screen(self, jobIDs) -> dict:
+        # {jobID: verdict} for every job, fetched concurrently
+        jobIDs = list(jobIDs)
+        if not jobIDs or self.headers is None:
+            return {jobID: "unknown" for jobID in jobIDs}
+        verdicts = asyncio.run(self.check_all(jobIDs))
+        for result in verdicts.values():
+            self.counts[result] = self.counts.get(result, 0) + 1
+        return verdicts
+
+    def summary(self) -> dict:
+        return dict(self.counts)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import re
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class AnswerMatcher:
+    # Resolves a form label to an answer without scanning every stored pair.
+    #
+    # Priority rules:
+    #   1. stored answers (qa.csv) win over the built-in patterns
+    #   2. among stored answers, the earliest stored question contained in the label wins
+    #   3. among built-in patterns, the first one in list order wins
+    #
+    # Stored questions live in an Aho-Corasick automaton, so a label is matched
+    # against all of them in a single pass over its characters. Questions added while
+    # the bot runs wait in a short side list, scanned directly, and are merged into the
+    # automaton in one rebuild once MERGE_AT of them have piled up.
+
+    MERGE_AT = 32
+
+    def __init__(self, answers: dict | None = None, patterns: list | None = None) -> None:
+        self.answers: list = []  # answer per stored question, by insertion order
+        self.index: dict = {}  # stored question -> position in self.answers
+        # trie as parallel lists, node 0 is the root
+        self.goto: list = [{}]
+        self.fail: list = [0]
+        self.best: list = [None]  # lowest pattern index ending here or on the fail chain
+        self.pending: list = []  # (question, index) not in the automaton yet
+        for question, answer in (answers or {}).items():
+            self.store(question, answer)
+        self.merge()
+        self.patterns = [(pattern, re.compile(pattern), answer) for pattern, answer in (patterns or [])]
+
+    def add(self, question, answer) -> None:
+        self.store(question, answer)
+        if len(self.pending) >= self.MERGE_AT:
+            self.merge()
+
+    def store(self, question, answer) -> None:
+        question = str(question).lower()
+        if not question:
+            return
+        if question in self.index:
+            # same question stored again keeps its priority, only the answer changes
+            self.answers[self.index[question]] = answer
+            return
+        idx = len(self.answers)
+        self.index[question] = idx
+        self.answers.append(answer)
+        self.pending.append((question, idx))
+
+    def merge(self) -> None:
+        # moves the side list into the trie and rebuilds the failure links
+        if not self.pending:
+            return
+        for question, _ in self.pending:
+            node = 0
+            for ch in question:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                node = nxt
+        self.pending = []
+        self.build()
+
+    def build(self) -> None:
+        # breadth-first pass computing failure links and the best match per node
+        self.fail = [0] * len(self.goto)
+        self.best = [None] * len(self.goto)
+        for question, idx in self.index.items():
+            node = 0
+            for ch in question:
+                node = self.goto[node][ch]
+            self.best[node] = idx
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                inherited = self.best[self.fail[child]]
+                if inherited is not None and (self.best[child] is None or inherited < self.best[child]):
+                    self.best[child] = inherited
+                queue.append(child)
+
+    def stored(self, question: str):
+        # answer of the earliest stored question contained in the label, or None
+        if not self.answers:
+            return None
+        question = question.lower()
+        found = None
+        node = 0
+        for ch in question:
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            idx = self.best[node]
+            if idx is not None and (found is None or idx < found):
+                found = idx
+                if found == 0:
+                    break
+        if found is None:
+            # pending questions are newer than every merged one, so they only
+            # count when the automaton found nothing
+            for pending, idx in self.pending:
+                if pending in question:
+                    found = idx
+                    break
+        return None if found is None else self.answers[found]
+
+    def builtin(self, question: str):
+        # (pattern, answer) of the first built-in pattern found in the label, or None
+        question = question.lower()
+        for pattern, compiled, answer in self.patterns:
+            if compiled.search(question):
+                return pattern, answer
+        return None
+
+    def __len__(self) -> int:
+        return len(self.answers)
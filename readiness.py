@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+log = logging.getLogger(__name__)
+
+
+# Scrolls the results list to its bottom so LinkedIn lazy-loads the next cards, and
+# reports how many cards are attached. Returns -1 on an explicit "no results" page.
+SEARCH_STATE_JS = """
+if (document.readyState !== 'complete') { return null; }
+if (document.querySelector('.jobs-search-no-results-banner, .jobs-search-two-pane__no-results-banner--expand')) {
+    return -1;
+}
+var list = document.querySelector('.jobs-search-results-list, .scaffold-layout__list > div');
+if (list) { list.scrollTo(0, list.scrollHeight); }
+return document.querySelectorAll('div[data-job-id]').length;
+"""
+
+# A job page is usable once it shows either an apply button or the "You applied on"
+# banner, whichever comes first
+JOB_STATE_JS = """
+if (document.readyState !== 'complete') { return null; }
+if (document.querySelector('button.jobs-apply-button')) { return 'apply_button'; }
+var banner = document.querySelector('.artdeco-inline-feedback, .jobs-s-apply, .jobs-details-top-card__apply-error');
+if (banner && /applied on/i.test(banner.textContent)) { return 'applied'; }
+if (document.querySelector('.jobs-unified-top-card, .job-details-jobs-unified-top-card__container--two-pane')
+        && document.querySelector('.jobs-apply-button--top-card, .jobs-s-apply')) {
+    return 'no_easy_apply';
+}
+return null;
+"""
+
+
+class PageReadiness:
+    # waits on concrete DOM conditions instead of fixed sleeps, every wait is bounded
+    # by a deadline and simply gives up (returns False) when it is reached
+
+    def __init__(self, browser, timeout: float = 10, poll: float = 0.25, settle: int = 3,
+                 empty_grace: float = 2) -> None:
+        self.browser = browser
+        self.timeout = timeout
+        self.poll = poll
+        # number of consecutive polls the job card count has to stay unchanged
+        self.settle = settle
+        # seconds a loaded page has to stay without cards before it counts as empty,
+        # the first cards may still be on their way
+        self.empty_grace = empty_grace
+
+    def wait_until(self, condition, timeout: float | None = None):
+        wait = WebDriverWait(self.browser, self.timeout if timeout is None else timeout,
+                             poll_frequency=self.poll, ignored_exceptions=(WebDriverException,))
+        try:
+            return wait.until(condition)
+        except TimeoutException:
+            log.debug("Page readiness deadline reached")
+            return False
+
+    def document_ready(self, timeout: float | None = None) -> bool:
+        return bool(self.wait_until(
+            lambda d: d.execute_script("return document.readyState") == "complete", timeout))
+
+    def search_results(self, timeout: float | None = None) -> int | None:
+        # wait until the job card count stops changing, returns the settled count, -1
+        # when LinkedIn says the search has no results, None when the deadline is reached
+        state = {"count": None, "stable": 0}
+        started = time.monotonic()
+
+        def settled(driver):
+            count = driver.execute_script(SEARCH_STATE_JS)
+            if count is None:
+                return False
+            if count == -1:
+                state["count"] = -1
+                return True
+            if count == state["count"]:
+                state["stable"] += 1
+            else:
+                state["stable"] = 0
+            state["count"] = count
+            if count == 0 and time.monotonic() - started < self.empty_grace:
+                return False
+            return state["stable"] >= self.settle
+
+        if not self.wait_until(settled, timeout):
+            return None
+        return state["count"]
+
+    def job_page(self, timeout: float | None = None) -> str | bool:
+        # 'apply_button', 'applied' or 'no_easy_apply', False on deadline
+        return self.wait_until(lambda d: d.execute_script(JOB_STATE_JS), timeout)
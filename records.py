@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+log = logging.getLogger(__name__)
+
+
+class RecordWriter:
+    # Append-only csv writer shared by out.csv and qa.csv. The file stays open, rows
+    # are buffered and written as one block when `flush_rows` rows are waiting,
+    # `flush_seconds` have passed or at shutdown. Each block is written under an
+    # exclusive lock on a sidecar .lock file, so worker processes appending to the
+    # same file never interleave. durability="fsync" also forces every block to disk.
+
+    def __init__(self, path: str, header: list | None = None, flush_rows: int = 20,
+                 flush_seconds: float = 5.0, durability: str = "flush") -> None:
+        if durability not in ("flush", "fsync"):
+            raise ValueError(f"durability must be 'flush' or 'fsync', not {durability!r}")
+        self.path = path
+        self.header = header
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.durability = durability
+        self.buffer: list = []
+        self.mutex = threading.Lock()
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.lock_file = open(path + ".lock", "a+b")
+        self.closed = False
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True,
+                                        name=f"flush {os.path.basename(path)}")
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def lock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        else:
+            self.lock_file.seek(0)
+            msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        else:
+            self.lock_file.seek(0)
+            msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def write(self, row: list) -> None:
+        with self.mutex:
+            self.buffer.append(row)
+            full = len(self.buffer) >= self.flush_rows
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self.mutex:
+            if not self.buffer or self.closed:
+                return
+            rows, self.buffer = self.buffer, []
+            block = io.StringIO()
+            writer = csv.writer(block, lineterminator="\n")
+            self.lock()
+            try:
+                if self.header and os.path.getsize(self.path) == 0:
+                    writer.writerow(self.header)
+                writer.writerows(rows)
+                self.file.write(block.getvalue())
+                self.file.flush()
+                if self.durability == "fsync":
+                    os.fsync(self.file.fileno())
+            finally:
+                self.unlock()
+
+    def flush_periodically(self) -> None:
+        while not self.closed:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                log.error("Could not flush %s: %s", self.path, e)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.flush()
+        with self.mutex:
+            self.closed = True
+            self.file.close()
+            self.lock_file.close()
@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from http.cookies import CookieError, SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from pagination import search_path
+
+log = logging.getLogger(__name__)
+
+INDEX = "index.json"
+
+SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+# Injected into replayed job pages: clicking the Easy Apply, next, review or submit
+# buttons swaps in the next recorded form step. The request is synchronous so the
+# new step is in the DOM by the time WebDriver's click returns.
+REPLAY_FORM_JS = """
+<script>
+(function () {
+    var jobID = location.pathname.split('/').filter(Boolean).pop();
+    var step = 0;
+    var buttons = "button.jobs-apply-button, button[aria-label='Continue to next step'], " +
+                  "button[aria-label='Review your application'], button[aria-label='Submit application']";
+    document.addEventListener('click', function (e) {
+        var button = e.target.closest ? e.target.closest(buttons) : null;
+        if (!button) { return; }
+        e.preventDefault();
+        e.stopPropagation();
+        var xhr = new XMLHttpRequest();
+        xhr.open('GET', '/__replay/form/' + jobID + '/' + step, false);
+        xhr.send();
+        if (xhr.status === 200) {
+            document.body.innerHTML = xhr.responseText;
+            step += 1;
+        }
+    }, true);
+})();
+</script>
+"""
+
+# Minimal stand-in for the LinkedIn login form, submitting it lands on /feed/
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>LinkedIn Login</title></head><body>
+<form action="/feed/" method="get">
+<input id="username" name="session_key"><input id="password" name="session_password" type="password">
+<button type="submit" class="btn__primary--large">Sign in</button>
+</form></body></html>"""
+
+FEED_PAGE = "<!DOCTYPE html><html><head><title>Feed | LinkedIn</title></head><body>feed</body></html>"
+
+
+def page_key(url: str) -> str:
+    # recorded pages are looked up by path and query, without scheme and host. Job
+    # views go by path only, LinkedIn adds tracking parameters to them. The query is
+    # unquoted, the browser may or may not have escaped the keywords.
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") or "/"
+    if path.startswith("/jobs/view/") or not parts.query:
+        return path
+    return path + "?" + unquote(parts.query)
+
+
+class Recorder:
+    # Saves the rendered DOM of search result pages, job views and Easy Apply form
+    # steps while the bot runs against LinkedIn, for ReplayServer to serve later.
+    # Scripts are stripped so replayed pages never call back home.
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX)
+        self.index: dict = {}
+        if os.path.isfile(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        self.form_steps: dict = {}  # jobID -> next form step number
+        self.mutex = threading.Lock()
+
+    def write(self, key: str, html: str) -> None:
+        with self.mutex:
+            # a page recorded again replaces its earlier file
+            name = self.index.get(key) or f"{len(self.index):05d}.html"
+            with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+                f.write(SCRIPT_RE.sub("", html))
+            self.index[key] = name
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1)
+            os.replace(tmp, self.index_path)
+
+    def page(self, browser) -> None:
+        # a search result page or job view, keyed by its URL
+        try:
+            html = browser.execute_script("return document.documentElement.outerHTML;")
+            self.write(page_key(browser.current_url), "<!DOCTYPE html>" + html)
+        except Exception as e:
+            log.error("Could not record page: %s", e)
+
+    def form_step(self, browser, jobID) -> None:
+        # the body of the page while an Easy Apply step is showing
+        jobID = str(jobID)
+        step = self.form_steps.get(jobID, 0)
+        try:
+            html = browser.execute_script("return document.body.innerHTML;")
+            self.write(f"/__replay/form/{jobID}/{step}", html)
+            self.form_steps[jobID] = step + 1
+        except Exception as e:
+            log.error("Could not record form step: %s", e)
+
+
+# Building blocks of a synthetic recording, see synthesize()
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>{keywords} Jobs | LinkedIn</title></head><body>
+<div class="jobs-search-results-list">
+{cards}
+</div></body></html>"""
+
+SEARCH_CARD = """<div data-job-id="{jobID}">
+<a class="job-card-container__link" href="/jobs/view/{jobID}/"><strong>{title}</strong></a>
+<div class="job-card-container__primary-description">{company}</div>
+<div class="job-card-container__metadata-item">{location}</div>
+<div class="job-card-container__footer-wrapper">{footer}</div>
+</div>"""
+
+NO_RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>Jobs | LinkedIn</title></head><body>
+<div class="jobs-search-no-results-banner">No matching jobs found.</div>
+</body></html>"""
+
+JOB_PAGE = """<!DOCTYPE html>
+<html><head><title>{title} | {company} | LinkedIn</title></head><body>
+<div class="jobs-unified-top-card"><h1>{title}</h1><div>{company}</div>
+{apply}
+</div></body></html>"""
+
+EASY_APPLY_BUTTON = '<button class="jobs-apply-button artdeco-button">Easy Apply</button>'
+OFFSITE_APPLY = '<div class="jobs-s-apply"><a href="#">Apply</a></div>'
+
+# Easy Apply steps: contact details and resume, a question, review, submit, sent
+FORM_STEPS = (
+    """<div class="jobs-easy-apply-modal" role="dialog">
+<div class="jobs-easy-apply-form-section__grouping">
+<label for="phone-{jobID}">Mobile phone number</label><input id="phone-{jobID}" type="text"></div>
+<input type="file" id="jobs-document-upload-file-input-upload-resume-{jobID}">
+<button aria-label="Continue to next step">Next</button></div>""",
+    """<div class="jobs-easy-apply-modal" role="dialog">
+<div class="jobs-easy-apply-form-section__grouping">
+<label for="years-{jobID}">How many years of experience do you have with Python?</label>
+<input id="years-{jobID}" type="text">
+<div class="artdeco-inline-feedback__message">Enter a whole number</div></div>
+<button aria-label="Continue to next step">Next</button></div>""",
+    """<div class="jobs-easy-apply-modal" role="dialog">
+<p>Additional questions answered</p>
+<button aria-label="Review your application">Review</button></div>""",
+    """<div class="jobs-easy-apply-modal" role="dialog">
+<label for="follow-company-checkbox">Follow {company}</label>
+<button aria-label="Submit application">Submit application</button></div>""",
+    """<div class="jobs-easy-apply-modal" role="dialog">
+<p>Your application was sent to {company}</p></div>""",
+)
+
+
+def synthesize(directory: str, positions: list, locations: list, experience_level=None,
+               jobs: int = 10, page_size: int = 25, offsite_every: int = 5) -> str:
+    # Writes a made-up recording of every position/location search: `jobs` Easy Apply
+    # cards per search over pages of `page_size`, each with a job view and the form
+    # steps above. Every `offsite_every`th job links off site instead. Lets the
+    # replay server and the benchmark run without a recording of LinkedIn.
+    recorder = Recorder(directory)
+    next_id = 4000000000
+    for position in positions:
+        for location in locations:
+            cards = []
+            for i in range(jobs):
+                job = {"jobID": str(next_id), "title": f"{position} {i + 1}",
+                       "company": f"Company {next_id % 1000}", "location": location}
+                next_id += 1
+                offsite = offsite_every and (i + 1) % offsite_every == 0
+                cards.append(SEARCH_CARD.format(footer="" if offsite else "Easy Apply", **job))
+                recorder.write(f"/jobs/view/{job['jobID']}", JOB_PAGE.format(
+                    apply=OFFSITE_APPLY if offsite else EASY_APPLY_BUTTON, **job))
+                if not offsite:
+                    for step, html in enumerate(FORM_STEPS):
+                        recorder.write(f"/__replay/form/{job['jobID']}/{step}", html.format(**job))
+            for start in range(0, jobs, page_size):
+                recorder.write(page_key(search_path(position, "&location=" + location, start,
+                                                    experience_level)),
+                               SEARCH_PAGE.format(keywords=position,
+                                                  cards="\n".join(cards[start:start + page_size])))
+            # past the last page LinkedIn shows its no results page
+            recorder.write(page_key(search_path(position, "&location=" + location, jobs,
+                                                experience_level)), NO_RESULTS_PAGE)
+    log.info("Wrote a synthetic recording of %s pages to %s", len(recorder.index), directory)
+    return directory
+
+
+class ReplayServer:
+    # Serves a recording over HTTP with a configurable per-request latency, plus a
+    # stand-in login page and session check so the bot runs end to end offline. Like
+    # LinkedIn, the API stand-ins answer 401 unless they get a session cookie the login
+    # handed out and its JSESSIONID back as csrf-token.
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0) -> None:
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        with open(os.path.join(directory, INDEX), encoding="utf-8") as f:
+            self.index: dict = {page_key(key): name for key, name in json.load(f).items()}
+        self.requests = 0
+        self.sessions: set = set()  # li_at values handed out by login()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive, as LinkedIn does, every response has a Content-Length
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                delay = server.latency + random.uniform(0, server.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+                status, body, kind = server.resolve(self.path, self.headers)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                if urlsplit(self.path).path.startswith("/feed"):
+                    for cookie in server.login():
+                        self.send_header("Set-Cookie", cookie)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                # format is http.server's own %-template, left to logging to apply
+                log.debug("replay: " + format, *args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def read(self, name: str) -> str:
+        with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+            return f.read()
+
+    def login(self) -> list:
+        # Set-Cookie values of a new session, what signing in hands out
+        token = secrets.token_hex(8)
+        self.sessions.add(token)
+        return [f"li_at={token}; Path=/", f'JSESSIONID="ajax:{token}"; Path=/']
+
+    def authorized(self, headers) -> bool:
+        cookies = SimpleCookie()
+        try:
+            cookies.load(headers.get("Cookie") or "")
+        except CookieError:
+            return False
+        token = cookies.get("li_at")
+        jsession = cookies.get("JSESSIONID")
+        return (token is not None and token.value in self.sessions and jsession is not None
+                and jsession.value.strip('"') == headers.get("csrf-token"))
+
+    def resolve(self, path: str, headers=None) -> tuple:
+        # (status, body, content type) for a request path
+        key = page_key(path)
+        route = urlsplit(path).path
+        if route.startswith("/login"):
+            return 200, LOGIN_PAGE, "text/html"
+        if route.startswith("/feed"):
+            return 200, FEED_PAGE, "text/html"
+        if route == "/robots.txt":
+            return 200, "User-agent: *\n", "text/plain"
+        if route.startswith("/voyager/") and not self.authorized(headers or {}):
+            return 401, "{}", "application/json"
+        if route == "/voyager/api/me":
+            return 200, "{}", "application/json"
+        if route.startswith("/voyager/api/jobs/jobPostings/"):
+            return self.posting(route.rstrip("/").rsplit("/", 1)[-1])
+        name = self.index.get(key)
+        if name is None:
+            return 404, "<html><body>not recorded</body></html>", "text/html"
+        body = self.read(name)
+        if route.startswith("/jobs/view/"):
+            body = body.replace("</body>", REPLAY_FORM_JS + "</body>", 1)
+        return 200, body, "text/html"
+
+    def posting(self, jobID: str) -> tuple:
+        # stand-in for the job posting API the pre-screen calls, derived from the
+        # recorded job view
+        name = self.index.get(f"/jobs/view/{jobID}")
+        if name is None:
+            return 404, "{}", "application/json"
+        body = self.read(name)
+        title = TITLE_RE.search(body)
+        apply_type = "ComplexOnsiteApply" if "jobs-apply-button" in body else "OffsiteApply"
+        posting = {
+            "title": title.group(1).strip() if title else "",
+            "jobState": "LISTED",
+            "applyMethod": {"$type": f"com.linkedin.voyager.jobs.{apply_type}"},
+            "applyingInfo": {"applied": "You applied on" in body},
+        }
+        return 200, json.dumps({"data": posting}), "application/json"
+
+    def start(self) -> "ReplayServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="replay")
+        self.thread.start()
+        log.info("Replaying %s pages from %s at %s", len(self.index), self.directory, self.base_url)
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Serve a recorded LinkedIn session")
+    parser.add_argument("directory")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds, up to this much")
+    parser.add_argument("--synthesize", type=int, metavar="JOBS",
+                        help="first write a synthetic recording with this many jobs per search of "
+                             "config.yaml to the directory")
+    parser.add_argument("--config", default="config.yaml")
+    args = parser.parse_args()
+    if args.synthesize:
+        import yaml
+
+        with open(args.config, 'r') as stream:
+            parameters = yaml.safe_load(stream)
+        synthesize(args.directory, [p for p in parameters['positions'] if p is not None],
+                   [l for l in parameters['locations'] if l is not None],
+                   parameters.get('experience_level'), jobs=args.synthesize)
+    replay = ReplayServer(args.directory, port=args.port, latency=args.latency, jitter=args.jitter)
+    log.info("Serving %s at %s", args.directory, replay.base_url)
+    replay.httpd.serve_forever()
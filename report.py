@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+
+log = logging.getLogger(__name__)
+
+# rows handed to SQLite at a time, memory use is bounded by this and not the file
+CHUNK_ROWS = 10000
+
+DIMENSIONS = ("position", "location", "company", "day")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS stats (dimension TEXT NOT NULL, key TEXT NOT NULL, "
+    "rows INTEGER NOT NULL, attempted INTEGER NOT NULL, applied INTEGER NOT NULL, "
+    "PRIMARY KEY (dimension, key))",
+    "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, rows INTEGER NOT NULL, "
+    "applied INTEGER NOT NULL)",
+)
+
+STATS_UPSERT = ("INSERT INTO stats (dimension, key, rows, attempted, applied) VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT(dimension, key) DO UPDATE SET rows = rows + 1, "
+                "attempted = attempted + excluded.attempted, applied = applied + excluded.applied")
+
+JOBS_UPSERT = ("INSERT INTO jobs (job_id, rows, applied) VALUES (?, 1, ?) "
+               "ON CONFLICT(job_id) DO UPDATE SET rows = rows + 1, applied = applied + excluded.applied")
+
+
+class Report:
+    # Aggregates the output csv into a small SQLite summary: rows, Easy Apply attempts
+    # and submitted applications per position, location, company and day, and rows per
+    # jobID for duplicates. The csv is streamed in chunks of complete lines from the
+    # byte offset the summary has reached, so a kept summary file makes every later
+    # report read only the rows appended since. A line still being written is left
+    # for next time.
+
+    def __init__(self, summary_path: str | None = None) -> None:
+        self.temporary = summary_path is None
+        if self.temporary:
+            fd, summary_path = tempfile.mkstemp(prefix="easyapplybot-report-", suffix=".db")
+            os.close(fd)
+        self.summary_path = summary_path
+        self.conn = sqlite3.connect(summary_path, isolation_level=None)
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+
+    def meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def reset(self) -> None:
+        for table in ("meta", "stats", "jobs"):
+            self.conn.execute(f"DELETE FROM {table}")
+
+    def update(self, filename: str) -> int:
+        # folds the rows added to `filename` since the last update in, returns how many
+        path = os.path.abspath(filename)
+        size = os.path.getsize(path)
+        offset = int(self.meta("offset", 0))
+        if self.meta("path") != path or size < offset:
+            # another file, or this one was truncated or replaced: start over
+            self.reset()
+            offset = 0
+        count = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for rows, end in self.chunks(f, offset):
+                with self.conn:
+                    self.conn.execute("BEGIN")
+                    self.add_rows(rows)
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [("path", path), ("offset", str(end))])
+                count += len(rows)
+        log.info("Read %s new rows from %s", count, filename)
+        return count
+
+    @staticmethod
+    def chunks(f, offset: int):
+        # (csv rows, byte offset after them) for every CHUNK_ROWS complete lines. A chunk
+        # is only cut where the quotes balance, so quoted newlines stay in one piece.
+        lines: list = []
+        quotes = 0
+        while True:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break  # end of file, or a row still being written
+            lines.append(line)
+            offset += len(line)
+            quotes += line.count(b'"')
+            if len(lines) >= CHUNK_ROWS and quotes % 2 == 0:
+                yield Report.parse(lines), offset
+                lines, quotes = [], 0
+        if lines and quotes % 2 == 0:
+            yield Report.parse(lines), offset
+
+    @staticmethod
+    def parse(lines: list) -> list:
+        text = b"".join(lines).decode("utf-8", errors="replace")
+        return list(csv.reader(io.StringIO(text)))
+
+    def add_rows(self, rows: list) -> None:
+        stats = []
+        jobs = []
+        for row in rows:
+            # timestamp, jobID, job, company, attempted, result[, position, location]
+            if len(row) < 6 or not row[1] or len(row[0]) < 10 or not row[0][:4].isdigit():
+                continue  # header or damaged row
+            attempted = int(row[4] == "True")
+            applied = int(row[5] == "True")
+            values = {"company": row[3], "day": row[0][:10],
+                      "position": row[6] if len(row) > 6 else "",
+                      "location": row[7] if len(row) > 7 else ""}
+            for dimension in DIMENSIONS:
+                if values[dimension]:
+                    stats.append((dimension, values[dimension], attempted, applied))
+            jobs.append((row[1], applied))
+        self.conn.executemany(STATS_UPSERT, stats)
+        self.conn.executemany(JOBS_UPSERT, jobs)
+
+    def summary(self, top: int = 20) -> dict:
+        # every row has a day, so the day breakdown adds up to the totals
+        totals = self.conn.execute(
+            "SELECT COALESCE(SUM(rows), 0), COALESCE(SUM(attempted), 0), COALESCE(SUM(applied), 0) "
+            "FROM stats WHERE dimension = 'day'").fetchone()
+        rows, attempted, applied = totals
+        result = {
+            "rows": rows,
+            "attempted": attempted,
+            "applied": applied,
+            "success_rate": rate(applied, attempted),
+            "failures": {
+                # the job had no Easy Apply button, was already applied to or filtered
+                "not_attempted": rows - attempted,
+                # Easy Apply was opened but the application was not submitted
+                "not_submitted": attempted - applied,
+            },
+        }
+        for dimension in DIMENSIONS:
+            order = "key DESC" if dimension == "day" else "rows DESC, key"
+            result[dimension] = [
+                {"key": key, "rows": n, "attempted": a, "applied": s, "success_rate": rate(s, a)}
+                for key, n, a, s in self.conn.execute(
+                    f"SELECT key, rows, attempted, applied FROM stats WHERE dimension = ? "
+                    f"ORDER BY {order} LIMIT ?", (dimension, top))]
+        jobs, duplicated, extra = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(rows > 1), 0), COALESCE(SUM(rows - 1), 0) FROM jobs").fetchone()
+        result["duplicates"] = {
+            "jobs": jobs,
+            "duplicated_jobs": duplicated,
+            "extra_rows": extra,
+            "applied_more_than_once": self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE applied > 1").fetchone()[0],
+            "top": [{"jobID": job_id, "rows": n, "applied": s} for job_id, n, s in self.conn.execute(
+                "SELECT job_id, rows, applied FROM jobs WHERE rows > 1 ORDER BY rows DESC LIMIT ?",
+                (top,))],
+        }
+        return result
+
+    def close(self) -> None:
+        self.conn.close()
+        if self.temporary:
+            os.remove(self.summary_path)
+
+
+def rate(part: int, whole: int) -> float | None:
+    return round(part / whole, 3) if whole else None
+
+
+def outcomes(applied_db: str) -> dict:
+    # {outcome: jobs} from the applied jobs index, which knows why a job failed. Only
+    # covers the retention window.
+    conn = sqlite3.connect(f"file:{applied_db}?mode=ro", uri=True)
+    try:
+        return dict(conn.execute("SELECT outcome, COUNT(*) FROM jobs GROUP BY outcome ORDER BY 2 DESC"))
+    finally:
+        conn.close()
+
+
+def format_text(summary: dict) -> str:
+    lines = [f"{summary['rows']} rows, {summary['attempted']} Easy Apply attempts, "
+             f"{summary['applied']} applications submitted, success rate {summary['success_rate']}",
+             f"failures: {summary['failures']}"]
+    if "outcomes" in summary:
+        lines.append(f"outcomes in the applied jobs index: {summary['outcomes']}")
+    for dimension in DIMENSIONS:
+        lines.append("")
+        lines.append(f"{dimension:<40} {'rows':>7} {'tried':>7} {'applied':>7} {'rate':>6}")
+        for entry in summary[dimension]:
+            success = "-" if entry["success_rate"] is None else f"{entry['success_rate']:.2f}"
+            lines.append(f"{entry['key'][:40]:<40} {entry['rows']:>7} {entry['attempted']:>7} "
+                         f"{entry['applied']:>7} {success:>6}")
+    duplicates = summary["duplicates"]
+    lines.append("")
+    lines.append(f"{duplicates['jobs']} distinct jobs, {duplicates['duplicated_jobs']} seen more than once "
+                 f"({duplicates['extra_rows']} extra rows), {duplicates['applied_more_than_once']} "
+                 f"applied to more than once")
+    for entry in duplicates["top"]:
+        lines.append(f"  {entry['jobID']}: {entry['rows']} rows, {entry['applied']} applied")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Success rates, failures and duplicates from the output csv")
+    parser.add_argument("output", nargs="?", default="out.csv", help="the bot's output csv")
+    parser.add_argument("--summary", help="keep the aggregates in this file, later reports only read new rows")
+    parser.add_argument("--applied-db", help="add the outcome counts of this applied jobs index")
+    parser.add_argument("--top", type=int, default=20, help="entries listed per breakdown")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of tables")
+    args = parser.parse_args()
+
+    report = Report(args.summary)
+    try:
+        report.update(args.output)
+        summary = report.summary(args.top)
+    finally:
+        report.close()
+    if args.applied_db:
+        summary["outcomes"] = outcomes(args.applied_db)
+    print(json.dumps(summary, indent=2) if args.json else format_text(summary))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+
+log = logging.getLogger(__name__)
+
+# job card fields rules can be written against
+FIELDS = ("title", "company", "location")
+
+
+class Rule:
+    # a keyword matches anywhere in the field, "/.../" is a regular expression; both
+    # are case-insensitive
+    def __init__(self, kind: str, field: str, pattern: str) -> None:
+        self.kind = kind
+        self.field = field
+        self.name = f"{kind} {field} {pattern}"
+        if len(pattern) > 2 and pattern.startswith("/") and pattern.endswith("/"):
+            self.regex = re.compile(pattern[1:-1], re.IGNORECASE)
+        else:
+            self.regex = re.compile(re.escape(pattern.strip()), re.IGNORECASE)
+
+    def matches(self, value: str) -> bool:
+        return self.regex.search(value) is not None
+
+
+class RuleSet:
+    # Include and exclude rules per card field, compiled once. A job is rejected when
+    # any exclude rule matches, or when a field has include rules and none of them
+    # matches. Fields the card does not carry are not judged. Every rejection is
+    # counted against the rule that caused it.
+    #
+    #   rules:
+    #     exclude:
+    #       title: [senior, "/\\blead\\b/"]
+    #     include:
+    #       location: [remote, london]
+
+    def __init__(self, rules: dict | None = None, blacklist: list | None = None,
+                 blacklist_titles: list | None = None) -> None:
+        rules = rules or {}
+        self.exclude: list = []
+        self.include: dict = {}  # field -> [Rule]
+        for kind in ("include", "exclude"):
+            for field, patterns in (rules.get(kind) or {}).items():
+                if field not in FIELDS:
+                    raise ValueError(f"Unknown rule field '{field}', expected one of {', '.join(FIELDS)}")
+                for pattern in patterns or []:
+                    self.add(kind, field, str(pattern))
+        # the older blacklist / blackListTitles options are exclude rules
+        for company in blacklist or []:
+            self.add("exclude", "company", str(company))
+        for title in blacklist_titles or []:
+            self.add("exclude", "title", str(title))
+        self.hits: dict = {}
+        self.mutex = threading.Lock()
+        log.info("Loaded %s exclude and %s include rules",
+                 len(self.exclude), sum(len(r) for r in self.include.values()))
+
+    def add(self, kind: str, field: str, pattern: str) -> None:
+        if not pattern.strip():
+            return
+        rule = Rule(kind, field, pattern)
+        if kind == "exclude":
+            self.exclude.append(rule)
+        else:
+            self.include.setdefault(field, []).append(rule)
+
+    def reject(self, card: dict) -> str | None:
+        # name of the rule rejecting the card, None when it passes
+        reason = None
+        for rule in self.exclude:
+            value = card.get(rule.field)
+            if value and rule.matches(value):
+                reason = rule.name
+                break
+        else:
+            for field, rules in self.include.items():
+                value = card.get(field)
+                if value and not any(rule.matches(value) for rule in rules):
+                    reason = f"include {field}"
+                    break
+        if reason is not None:
+            with self.mutex:
+                self.hits[reason] = self.hits.get(reason, 0) + 1
+        return reason
+
+    def summary(self) -> dict:
+        with self.mutex:
+            return dict(sorted(self.hits.items(), key=lambda item: -item[1]))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import random
+from datetime import datetime
+from itertools import product
+
+log = logging.getLogger(__name__)
+
+# gaps between two rows of the same combo longer than this are not counted as time
+# spent on it (the bot was on another combo, or not running)
+MAX_GAP = 10 * 60
+
+
+def combo_yields(filename: str) -> dict:
+    # {(position, location): successful applications per minute}, streamed from the
+    # output csv. Only rows written with their combo (8 columns) carry the information.
+    applied: dict = {}
+    seconds: dict = {}
+    last: dict = {}
+    if not filename or not os.path.isfile(filename):
+        return {}
+    with open(filename, newline='', encoding='utf-8', errors='replace') as f:
+        for row in csv.reader(f):
+            if len(row) < 8 or not row[6]:
+                continue
+            try:
+                ts = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S").timestamp()
+            except ValueError:
+                continue
+            combo = (row[6], row[7])
+            if combo in last and 0 <= ts - last[combo] <= MAX_GAP:
+                seconds[combo] = seconds.get(combo, 0) + ts - last[combo]
+            last[combo] = ts
+            applied[combo] = applied.get(combo, 0) + (row[5] == "True")
+    # every combo counts at least a minute, a single row has no measurable duration
+    return {combo: applied[combo] / max(seconds.get(combo, 0) / 60, 1) for combo in applied}
+
+
+class ComboScheduler:
+    # Enumerates positions x locations once and orders the combos by historical yield
+    # times their configured weight. Combos without history are scored at the average
+    # known yield so they still get explored, combos that ran without producing a
+    # single application are rotated to the back. Weights and exclusions are keyed by
+    # position, by location, or by "position|location".
+
+    def __init__(self, positions: list, locations: list, history_file: str | None = None,
+                 weights: dict | None = None, exclude: list | None = None,
+                 max_combos: int = 500) -> None:
+        weights = weights or {}
+        excluded = set(exclude or [])
+        yields = combo_yields(history_file)
+        known = [y for y in yields.values() if y > 0]
+        prior = sum(known) / len(known) if known else 1.0
+
+        scored = []
+        for position, location in product(positions, locations):
+            keys = (position, location, f"{position}|{location}")
+            if any(key in excluded for key in keys):
+                continue
+            weight = 1.0
+            for key in keys:
+                weight *= float(weights.get(key, 1.0))
+            history = yields.get((position, location))
+            exhausted = history == 0
+            score = (prior if history is None else history) * weight
+            # random tie breaker keeps the original shuffled order among equals
+            scored.append((exhausted, -score, random.random(), (position, location)))
+        scored.sort()
+        self.combos = [combo for *_, combo in scored][:max_combos]
+        log.info("Scheduled %s combos, %s with history", len(self.combos), len(yields))
+
+    def __iter__(self):
+        return iter(self.combos)
+
+    def __len__(self) -> int:
+        return len(self.combos)
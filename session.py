@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+
+LOCAL_STORAGE_DUMP_JS = """
+var out = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    out[key] = window.localStorage.getItem(key);
+}
+return out;
+"""
+
+LOCAL_STORAGE_LOAD_JS = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+# A single authenticated API call from inside the page, resolves to the HTTP status.
+# LinkedIn wants the JSESSIONID value echoed back as csrf-token.
+SESSION_CHECK_JS = """
+var done = arguments[arguments.length - 1];
+var match = document.cookie.match(/JSESSIONID="?([^";]+)/);
+fetch('/voyager/api/me', {
+    credentials: 'include',
+    headers: {'csrf-token': match ? match[1] : '', 'accept': 'application/json'}
+}).then(function (r) { done(r.status); }, function () { done(0); });
+"""
+
+
+class SessionCache:
+    # authenticated cookies and local storage kept on disk between runs, so a still
+    # valid session skips the login form entirely
+
+    def __init__(self, path: str | None, base_url: str = "https://www.linkedin.com") -> None:
+        # without a path the session is only carried over in memory, see capture()
+        self.path = path
+        self.base_url = base_url.rstrip("/")
+
+    def capture(self, browser) -> dict:
+        return {
+            "saved_at": time.time(),
+            "cookies": browser.get_cookies(),
+            "local_storage": browser.execute_script(LOCAL_STORAGE_DUMP_JS) or {},
+        }
+
+    def save(self, browser) -> None:
+        state = self.capture(browser)
+        # the file holds live credentials, keep it private and never half written
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+        log.info("Saved session to %s", self.path)
+
+    def restore(self, browser) -> bool:
+        # True when the cached session was loaded and is still accepted by LinkedIn
+        if not self.path or not os.path.isfile(self.path):
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            log.info("Session cache %s could not be read: %s", self.path, e)
+            return False
+        if self.apply(browser, state):
+            log.info("Restored session from cache")
+            return True
+        log.info("Cached session has expired")
+        return False
+
+    def apply(self, browser, state: dict) -> bool:
+        # loads a captured session into a browser, True when LinkedIn still accepts it.
+        # Cookies and local storage can only be set for the origin currently loaded,
+        # robots.txt is the cheapest page on it.
+        browser.get(self.base_url + "/robots.txt")
+        for cookie in state.get("cookies", []):
+            cookie.pop("sameSite", None)
+            try:
+                browser.add_cookie(cookie)
+            except Exception as e:
+                log.debug("Could not restore cookie %s: %s", cookie.get('name'), e)
+        browser.execute_script(LOCAL_STORAGE_LOAD_JS, state.get("local_storage", {}))
+
+        if self.is_valid(browser):
+            return True
+        browser.delete_all_cookies()
+        return False
+
+    def is_valid(self, browser) -> bool:
+        try:
+            status = browser.execute_async_script(SESSION_CHECK_JS)
+        except Exception as e:
+            log.debug("Session check failed: %s", e)
+            return False
+        return status == 200
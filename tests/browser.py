@@ -0,0 +1,70 @@
+import re
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+from session import LOCAL_STORAGE_DUMP_JS, LOCAL_STORAGE_LOAD_JS, SESSION_CHECK_JS
+
+
+class HttpBrowser:
+    # The parts of a WebDriver session SessionCache and PreScreen use, over plain HTTP
+    # with a cookie jar, so they run against ReplayServer without Chrome. Like
+    # WebDriver, cookies can only be added for the origin currently loaded.
+
+    def __init__(self) -> None:
+        self.cookies: dict = {}  # name -> WebDriver style cookie dict
+        self.local_storage: dict = {}
+        self.current_url = None
+        self.requests: list = []
+
+    def request(self, url: str, headers: dict | None = None) -> tuple:
+        # (status, Set-Cookie values)
+        self.requests.append(urlsplit(url).path)
+        headers = dict(headers or {})
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in self.cookies.values())
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+                response.read()
+                return response.status, response.headers.get_all("Set-Cookie") or []
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get_all("Set-Cookie") or []
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        _, set_cookies = self.request(url)
+        for value in set_cookies:
+            name, _, rest = value.partition("=")
+            self.cookies[name] = {"name": name, "value": rest.split(";")[0], "path": "/",
+                                  "domain": urlsplit(url).hostname, "secure": False,
+                                  "httpOnly": False, "sameSite": "Lax"}
+
+    def get_cookies(self) -> list:
+        return [dict(cookie) for cookie in self.cookies.values()]
+
+    def add_cookie(self, cookie: dict) -> None:
+        if self.current_url is None or urlsplit(self.current_url).hostname != cookie.get("domain"):
+            raise ValueError("invalid cookie domain")
+        self.cookies[cookie["name"]] = dict(cookie)
+
+    def delete_all_cookies(self) -> None:
+        self.cookies = {}
+
+    def execute_script(self, script: str, *args):
+        if script == LOCAL_STORAGE_DUMP_JS:
+            return dict(self.local_storage)
+        if script == LOCAL_STORAGE_LOAD_JS:
+            self.local_storage.update(args[0])
+            return None
+        raise NotImplementedError(script)
+
+    def execute_async_script(self, script: str, *args):
+        if script != SESSION_CHECK_JS:
+            raise NotImplementedError(script)
+        parts = urlsplit(self.current_url)
+        match = re.search(r'JSESSIONID="?([^";]+)', "; ".join(
+            f"{c['name']}={c['value']}" for c in self.cookies.values()))
+        status, _ = self.request(f"{parts.scheme}://{parts.netloc}/voyager/api/me",
+                                 {"csrf-token": match.group(1) if match else "",
+                                  "accept": "application/json"})
+        return status
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import easyapplybot
+from checkpoint import Checkpoint
+from easyapplybot import EasyApplyBot
+from jobstore import AppliedJobStore
+from rules import RuleSet
+
+# &start= offset -> number of job cards on that search page
+PAGES = {0: 25, 25: 25, 50: 10}
+
+
+class ApplicationsLoopTest(unittest.TestCase):
+    # the search loop of one combo, with the browser, the search pages and the
+    # applications stubbed out
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        bot = EasyApplyBot.__new__(EasyApplyBot)
+        bot.headless = True
+        bot.browser = mock.MagicMock()
+        bot.max_pages = 10
+        bot.max_search_time = 3600
+        bot.experience_level = []
+        bot.metrics = mock.MagicMock()
+        bot.checkpoint = Checkpoint(None)
+        bot.applied_store = AppliedJobStore(os.path.join(self.tmp.name, "applied.db"))
+        bot.rules = RuleSet()
+        bot.prescreen = None
+        bot.maintain_browser = mock.MagicMock()
+        bot.ensure_browser = mock.MagicMock(return_value=True)
+        self.bot = bot
+        self.loaded = []  # &start= of every search page load
+        self.current = None
+        self.load_failures = set()
+        bot.next_jobs_page = self.next_jobs_page
+
+    def tearDown(self):
+        self.bot.applied_store.close()
+        self.tmp.cleanup()
+
+    def next_jobs_page(self, position, location, start, experience_level=None):
+        self.loaded.append(start)
+        if start in self.load_failures:
+            self.load_failures.discard(start)
+            raise TimeoutError("search page timed out")
+        self.current = start
+        return self.bot.browser, start
+
+    def cards(self, browser):
+        count = PAGES.get(self.current, 0)
+        return [{"jobID": str(self.current + i), "applied": False, "title": "Engineer"}
+                for i in range(count)]
+
+    def run_loop(self, apply_to_job):
+        self.bot.apply_to_job = apply_to_job
+        with mock.patch.object(easyapplybot, "harvest_cards", self.cards):
+            self.bot.applications_loop("engineer", "&location=London")
+
+    def test_failing_job_does_not_end_search(self):
+        applied = []
+
+        def apply_to_job(jobID):
+            if jobID == "3":
+                raise IndexError("list index out of range")
+            applied.append(jobID)
+            return True
+
+        self.run_loop(apply_to_job)
+        self.assertEqual(self.loaded, [0, 25, 50])
+        self.assertEqual(len(applied), 59)
+        self.assertEqual(self.bot.applied_store.outcome("3"), "error")
+        self.bot.ensure_browser.assert_called_once()
+
+    def test_failed_page_load_is_retried(self):
+        self.load_failures = {25}
+        self.run_loop(lambda jobID: True)
+        self.assertEqual(self.loaded, [0, 25, 25, 50])
+
+
+class WriteToFileTest(unittest.TestCase):
+    def test_title_without_company(self):
+        bot = EasyApplyBot.__new__(EasyApplyBot)
+        bot.current_combo = ("engineer", "London")
+        bot.metrics = mock.MagicMock()
+        bot.out_writer = mock.MagicMock()
+        bot.write_to_file(False, "1", "Page not found", False)
+        row = bot.out_writer.write.call_args[0][0]
+        self.assertEqual(row[1:6], ["1", "Page not found", None, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import time
+import unittest
+
+from governor import Governor, throttle_reason
+from readiness import PageReadiness
+
+
+class GovernorTest(unittest.TestCase):
+    def test_buckets_allow_a_burst_then_pace(self):
+        governor = Governor(navigations_per_minute=6000, submissions_per_minute=6000, burst=2,
+                            api_requests_per_minute=600)
+        self.assertEqual(governor.wait("api"), 0)
+        self.assertEqual(governor.wait("api"), 0)
+        # the third request waits for the 0.1s interval, the other buckets are untouched
+        self.assertGreater(governor.wait("api"), 0.05)
+        self.assertEqual(governor.wait("navigate"), 0)
+
+    def test_throttle_slows_down_and_clean_pages_ease_it(self):
+        governor = Governor(backoff=0.01, ramp_after=2)
+        governor.throttled("API status 429")
+        self.assertEqual(governor.slowdown, 2)
+        governor.clean()
+        governor.clean()
+        self.assertEqual(governor.slowdown, 1.5)
+        self.assertEqual(governor.summary()["signals"], {"API status 429": 1})
+
+    def test_throttle_reason(self):
+        self.assertEqual(throttle_reason("https://www.linkedin.com/checkpoint/challenge", ""),
+                         "redirected to /checkpoint/")
+        self.assertIsNotNone(throttle_reason("", "Security Verification | LinkedIn"))
+        self.assertIsNone(throttle_reason("https://www.linkedin.com/jobs/search/", "Jobs | LinkedIn"))
+
+
+class SearchResultsTest(unittest.TestCase):
+    # the card count SEARCH_STATE_JS reports, one value per poll
+    def count(self, *polls, timeout=0.3, empty_grace=0.0) -> int | None:
+        answers = iter(polls)
+
+        class Driver:
+            def execute_script(self, script):
+                return next(answers, polls[-1])
+
+        return PageReadiness(Driver(), timeout=timeout, poll=0.01,
+                             empty_grace=empty_grace).search_results()
+
+    def test_no_results_banner_is_not_an_empty_page(self):
+        self.assertEqual(self.count(None, -1), -1)
+        self.assertEqual(self.count(None, 0), 0)
+
+    def test_empty_page_settles_before_the_deadline(self):
+        start = time.monotonic()
+        self.assertEqual(self.count(None, 0, timeout=5, empty_grace=0.2), 0)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_deadline_is_not_an_empty_page(self):
+        self.assertIsNone(self.count(None, timeout=0.05))
+
+    def test_waits_for_the_count_to_settle(self):
+        self.assertEqual(self.count(None, 7, 25, 25, 25, 25), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
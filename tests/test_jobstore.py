@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+import unittest
+
+from jobstore import AppliedJobStore
+
+
+class AppliedJobStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "applied.db")
+        # two workers sharing one index
+        self.store = AppliedJobStore(self.path)
+        self.other = AppliedJobStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.other.close()
+        self.tmp.cleanup()
+
+    def test_only_one_worker_gets_a_claim(self):
+        self.assertTrue(self.store.claim("1"))
+        self.assertFalse(self.other.claim("1"))
+        self.store.add("1", "applied")
+        self.assertFalse(self.other.claim("1"))
+        self.assertIn("1", self.store)
+
+    def test_abandoned_claim_can_be_taken_over(self):
+        self.store.claim("1")
+        self.store.conn.execute("UPDATE jobs SET ts = ? WHERE job_id = '1'",
+                                (time.time() - AppliedJobStore.CLAIM_TIMEOUT - 1,))
+        self.assertTrue(self.other.claim("1"))
+        self.assertFalse(self.store.claim("1"))
+
+    def test_release_drops_only_claims(self):
+        self.store.claim("1")
+        self.store.add("2", "failed")
+        self.store.release("1")
+        self.store.release("2")
+        self.assertIsNone(self.store.outcome("1"))
+        self.assertEqual(self.store.outcome("2"), "failed")
+        self.assertTrue(self.other.claim("1"))
+
+    def test_deferred_job_is_requeued_once_answered(self):
+        self.store.claim("9")
+        self.store.defer("9", ["visa?", "salary?"])
+        self.store.add("9", "deferred")
+        self.assertEqual(self.store.deferred_questions(), {"visa?": ["9"], "salary?": ["9"]})
+        self.assertEqual(self.store.answered(["visa?"]), [])
+        self.assertEqual(self.store.answered(["salary?"]), ["9"])
+        self.assertEqual(self.other.requeued(), ["9"])
+
+        # a requeued job is claimed by one worker only, and is no longer requeued
+        self.assertTrue(self.store.claim("9"))
+        self.assertFalse(self.other.claim("9"))
+        self.assertEqual(self.store.outcome("9"), "in_progress")
+        self.assertEqual(self.other.requeued(), [])
+
+    def test_old_jobs_are_pruned_but_deferred_ones_kept(self):
+        old = time.time() - 3 * 24 * 60 * 60
+        self.store.conn.executemany("INSERT INTO jobs (job_id, outcome, ts) VALUES (?, ?, ?)",
+                                    [("1", "applied", old), ("2", "deferred", old)])
+        reopened = AppliedJobStore(self.path, retention_days=2)
+        self.assertNotIn("1", reopened)
+        self.assertIn("2", reopened)
+        reopened.close()
+
+    def test_import_csv_once(self):
+        csv_path = os.path.join(self.tmp.name, "out.csv")
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(f"{now},5,Engineer,ACME,True,True\n{now},6,Engineer,ACME,True,False\nbad row\n")
+        self.assertEqual(self.store.import_csv(csv_path), 2)
+        self.assertEqual(self.store.outcome("5"), "applied")
+        self.assertEqual(self.store.outcome("6"), "failed")
+        self.assertEqual(self.store.import_csv(csv_path), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import logging
+import unittest
+
+from logconfig import ContextFilter, JsonFormatter, RateLimitFilter, set_context
+
+
+def record(msg, *args, level=logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("applyJobs", level, __file__, 1, msg, args, None)
+
+
+class RateLimitFilterTest(unittest.TestCase):
+    def test_same_text_is_held_back(self):
+        limit = RateLimitFilter(60)
+        self.assertTrue(limit.filter(record("Easy Apply button not found")))
+        self.assertFalse(limit.filter(record("Easy Apply button not found")))
+        self.assertFalse(limit.filter(record("Easy Apply button not found")))
+        self.assertEqual(limit.seen[("applyJobs", logging.INFO, "Easy Apply button not found")][1], 2)
+
+    def test_different_arguments_all_pass(self):
+        limit = RateLimitFilter(60)
+        for jobID in range(5):
+            self.assertTrue(limit.filter(record("Applied to %s", jobID)))
+
+    def test_warnings_always_pass(self):
+        limit = RateLimitFilter(60)
+        for _ in range(3):
+            self.assertTrue(limit.filter(record("Throttling suspected", level=logging.WARNING)))
+
+    def test_next_message_through_counts_the_dropped_ones(self):
+        limit = RateLimitFilter(0.01)
+        limit.filter(record("Loading next job page?"))
+        limit.filter(record("Loading next job page?"))
+        limit.seen[("applyJobs", logging.INFO, "Loading next job page?")][0] -= 1
+        later = record("Loading next job page?")
+        self.assertTrue(limit.filter(later))
+        self.assertEqual(later.suppressed, 1)
+
+
+class JsonFormatterTest(unittest.TestCase):
+    def test_record_carries_job_and_combo(self):
+        set_context(combo="Engineer|Remote", jobID="42")
+        try:
+            entry = record("Applied to %s", "42")
+            ContextFilter().filter(entry)
+        finally:
+            set_context(combo=None, jobID=None)
+        line = json.loads(JsonFormatter().format(entry))
+        self.assertEqual((line["msg"], line["jobID"], line["combo"]),
+                         ("Applied to 42", "42", "Engineer|Remote"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from modal import modal_state
+from readiness import PageReadiness
+
+
+class ScriptedDriver:
+    # answers MODAL_STATE_JS from a function of its (previous, seen) arguments
+    def __init__(self, answer) -> None:
+        self.answer = answer
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.answer(len(self.calls), *args)
+
+
+class ModalStateTest(unittest.TestCase):
+    def state(self, driver, **kwargs) -> dict:
+        return modal_state(PageReadiness(driver, poll=0.01), 0.3, **kwargs)
+
+    def test_waits_for_the_modal_to_open(self):
+        driver = ScriptedDriver(lambda n, previous, seen: None if n < 3 else {"state": "next", "step": "a"})
+        self.assertEqual(self.state(driver, seen=False)["state"], "next")
+        self.assertEqual(driver.calls[0], (None, False))
+
+    def test_modal_that_never_opens_times_out(self):
+        driver = ScriptedDriver(lambda n, previous, seen: None)
+        self.assertEqual(self.state(driver, seen=False)["state"], "timeout")
+
+    def test_waits_for_the_step_to_change(self):
+        driver = ScriptedDriver(lambda n, previous, seen: None if n < 3 else {"state": "review", "step": "b"})
+        self.assertEqual(self.state(driver, previous="a")["state"], "review")
+        self.assertTrue(all(args == ("a", True) for args in driver.calls))
+
+    def test_unchanged_step_is_classified_at_the_deadline(self):
+        driver = ScriptedDriver(lambda n, previous, seen: None if previous else {"state": "error", "step": "a"})
+        self.assertEqual(self.state(driver, previous="a")["state"], "error")
+        self.assertEqual(driver.calls[-1], (None, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from pagination import Paginator
+
+
+def page(first: int, count: int) -> list:
+    return [{"jobID": str(i)} for i in range(first, first + count)]
+
+
+class PaginatorTest(unittest.TestCase):
+    def test_offset_advances_by_cards_shown(self):
+        paginator = Paginator(start=50)
+        self.assertEqual(paginator.record(page(0, 25)), 25)
+        self.assertEqual(paginator.start, 75)
+        self.assertTrue(paginator.has_next())
+
+    def test_empty_page_ends_search(self):
+        paginator = Paginator()
+        paginator.record(page(0, 25))
+        paginator.record([])
+        self.assertFalse(paginator.has_next())
+        self.assertEqual(paginator.reason, "end of results")
+
+    def test_short_page_is_the_last(self):
+        paginator = Paginator()
+        paginator.record(page(0, 25))
+        paginator.record(page(25, 7))
+        self.assertEqual(paginator.reason, "last page")
+
+    def test_repeated_page_ends_search(self):
+        paginator = Paginator()
+        paginator.record(page(0, 25))
+        self.assertEqual(paginator.record(page(0, 25)), 0)
+        self.assertEqual(paginator.reason, "no new jobs on page")
+
+    def test_page_budget(self):
+        paginator = Paginator(max_pages=2)
+        paginator.record(page(0, 25))
+        paginator.record(page(25, 25))
+        self.assertFalse(paginator.has_next())
+        self.assertEqual(paginator.reason, "page budget reached")
+
+    def test_only_consecutive_failures_end_search(self):
+        paginator = Paginator(max_errors=2)
+        paginator.failed()
+        paginator.record(page(0, 25))
+        paginator.failed()
+        self.assertTrue(paginator.has_next())
+        paginator.failed()
+        self.assertFalse(paginator.has_next())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import pipeline
+from governor import PAGE_SIGNAL_JS, Governor
+from pipeline import consume
+from readiness import SEARCH_STATE_JS
+
+# &start= offset -> number of job cards on that search page
+PAGES = {0: 25, 25: 25, 50: 5}
+
+
+class SearchBrowser:
+    # the harvest browser: search pages with PAGES cards each
+    def __init__(self, title: str = "Jobs | LinkedIn") -> None:
+        self.url = None
+        self.title = title
+        self.loaded: list = []
+
+    @property
+    def start(self) -> int:
+        return int(parse_qs(urlsplit(self.url).query)["start"][0])
+
+    def get(self, url: str) -> None:
+        self.url = url
+        self.loaded.append(self.start)
+
+    def execute_script(self, script: str, *args):
+        if script == SEARCH_STATE_JS:
+            return PAGES.get(self.start, 0)
+        if script == PAGE_SIGNAL_JS:
+            return [self.url, self.title]
+        raise NotImplementedError(script)
+
+
+def cards(browser) -> list:
+    return [{"jobID": str(browser.start + i), "applied": False} for i in range(PAGES.get(browser.start, 0))]
+
+
+class StubBot:
+    # what consume() and the Harvester use of the bot
+    PAGE_TIMEOUT = 2
+    max_pages = 10
+    max_search_time = 60
+    blocker = None
+
+    def __init__(self, failing=()) -> None:
+        self.harvest_browser = SearchBrowser()
+        self.governor = Governor(60000, 60000, api_requests_per_minute=60000)
+        self.metrics = mock.MagicMock()
+        self.applied_store: set = set()
+        self.applied: list = []
+        self.failing = set(failing)
+        self.ensure_browser = mock.MagicMock(return_value=True)
+
+    def get_harvest_browser(self):
+        return self.harvest_browser
+
+    def pace(self, kind: str) -> None:
+        self.governor.wait(kind)
+
+    def search_url(self, position, location, start) -> str:
+        return f"http://replay/jobs/search/?keywords={position}{location}&start={start}"
+
+    def filter_cards(self, found) -> dict:
+        return {card["jobID"]: "To be processed" for card in found}
+
+    def apply_loop(self, jobIDs) -> None:
+        for jobID in jobIDs:
+            self.applied_store.add(jobID)
+            if jobID in self.failing:
+                raise IndexError("list index out of range")
+            self.applied.append(jobID)
+
+
+class ConsumeTest(unittest.TestCase):
+    def run_consume(self, bot, start=0) -> None:
+        with mock.patch.object(pipeline, "harvest_cards", cards):
+            consume(bot, "engineer", "&location=Remote", maxsize=10, start=start)
+
+    def test_applies_to_every_harvested_job(self):
+        bot = StubBot()
+        self.run_consume(bot)
+        self.assertEqual(bot.harvest_browser.loaded, [0, 25, 50])
+        self.assertEqual(bot.applied, [str(i) for i in range(55)])
+
+    def test_resumes_at_the_given_offset(self):
+        bot = StubBot()
+        self.run_consume(bot, start=25)
+        self.assertEqual(bot.harvest_browser.loaded, [25, 50])
+        self.assertEqual(len(bot.applied), 30)
+
+    def test_failing_job_does_not_end_the_run(self):
+        bot = StubBot(failing={"3"})
+        self.run_consume(bot)
+        self.assertEqual(len(bot.applied), 54)
+        bot.ensure_browser.assert_called_once()
+
+    def throttles(self, title: str) -> list:
+        bot = StubBot()
+        # longer than PageReadiness.empty_grace, an empty page has to settle
+        bot.PAGE_TIMEOUT = 5
+        bot.harvest_browser = SearchBrowser(title)
+        with mock.patch.dict(PAGES, {0: 0}, clear=True), \
+                mock.patch.object(bot.governor, "throttled") as throttled:
+            self.run_consume(bot)
+        return [c.args[0] for c in throttled.call_args_list]
+
+    def test_empty_first_page_is_a_throttle_sign(self):
+        self.assertEqual(self.throttles("Jobs | LinkedIn"), ["empty results"])
+
+    def test_flagged_empty_page_is_throttled_once(self):
+        self.assertEqual(len(self.throttles("Security Verification | LinkedIn")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
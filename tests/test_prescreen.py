@@ -0,0 +1,105 @@
+import tempfile
+import unittest
+
+from governor import Governor
+from prescreen import PreScreen, verdict
+from replay import ReplayServer, synthesize
+from rules import RuleSet
+from tests.browser import HttpBrowser
+
+# synthetic job IDs of the one search below, every fifth job links off site
+EASY = ["4000000000", "4000000001", "4000000002"]
+OFFSITE = "4000000004"
+
+
+class VerdictTest(unittest.TestCase):
+    def test_verdicts(self):
+        easy = {"$type": "com.linkedin.voyager.jobs.ComplexOnsiteApply"}
+        self.assertEqual(verdict({"data": {"applyMethod": easy}}), "eligible")
+        self.assertEqual(verdict({"data": {"jobState": "CLOSED", "applyMethod": easy}}), "closed")
+        self.assertEqual(verdict({"data": {"applyingInfo": {"applied": True}}}), "already_applied")
+        self.assertEqual(verdict({"applyMethod": {"$type": "com.linkedin.voyager.jobs.OffsiteApply"}}),
+                         "no_easy_apply")
+        rules = RuleSet({"exclude": {"title": ["senior"]}})
+        self.assertEqual(verdict({"data": {"title": "Senior Engineer"}}, rules), "filtered")
+
+    def test_missing_fields_never_rule_a_job_out(self):
+        self.assertEqual(verdict({}), "eligible")
+        self.assertEqual(verdict({"data": {"applyMethod": None, "applyingInfo": None}}), "eligible")
+
+
+class PreScreenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.recording = tempfile.TemporaryDirectory()
+        synthesize(cls.recording.name, ["Engineer"], ["Remote"], jobs=5)
+        cls.replay = ReplayServer(cls.recording.name).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.replay.stop()
+        cls.recording.cleanup()
+
+    def setUp(self):
+        self.prescreen = PreScreen(self.replay.base_url, RuleSet({"exclude": {"title": ["/Engineer 2\\b/"]}}),
+                                   concurrency=3)
+
+    def tearDown(self):
+        self.prescreen.close()
+
+    def cookies(self) -> list:
+        browser = HttpBrowser()
+        browser.get(self.replay.base_url + "/feed/")
+        return browser.get_cookies()
+
+    def test_screen(self):
+        self.prescreen.use_cookies(self.cookies())
+        result = self.prescreen.screen(EASY + [OFFSITE, "1"])
+        self.assertEqual(result, {
+            "4000000000": "eligible",
+            "4000000001": "filtered",  # "Engineer 2"
+            "4000000002": "eligible",
+            OFFSITE: "no_easy_apply",
+            "1": "unknown",  # not recorded, 404
+        })
+        self.assertEqual(self.prescreen.summary(),
+                         {"eligible": 2, "filtered": 1, "no_easy_apply": 1, "unknown": 1})
+        # keep-alive connections go back to the pool
+        self.assertFalse(self.prescreen.pool.empty())
+
+    def test_without_cookies_nothing_is_fetched(self):
+        requests = self.replay.requests
+        self.assertTrue(self.prescreen.needs_cookies)
+        self.assertEqual(self.prescreen.screen(EASY), dict.fromkeys(EASY, "unknown"))
+        self.assertEqual(self.replay.requests, requests)
+
+    def test_rate_limited_requests_are_paced_and_reported(self):
+        governor = Governor(backoff=0.01)
+        prescreen = PreScreen(self.replay.base_url, governor=governor)
+        prescreen.use_cookies(self.cookies())
+        posting = self.replay.posting
+        # LinkedIn's "request denied" for one of the jobs
+        self.replay.posting = lambda jobID: (999, "{}", "application/json") if jobID == EASY[1] \
+            else posting(jobID)
+        try:
+            result = prescreen.screen(EASY)
+        finally:
+            del self.replay.posting
+            prescreen.close()
+        self.assertEqual(result[EASY[1]], "unknown")
+        self.assertEqual(result[EASY[0]], "eligible")
+        self.assertEqual(governor.summary()["signals"], {"API status 999": 1})
+        self.assertEqual(governor.slowdown, 2)
+
+    def test_refused_session_asks_for_cookies_again(self):
+        cookies = self.cookies()
+        for cookie in cookies:
+            if cookie["name"] == "li_at":
+                cookie["value"] = "expired"
+        self.prescreen.use_cookies(cookies)
+        self.assertEqual(self.prescreen.screen(EASY), dict.fromkeys(EASY, "unknown"))
+        self.assertTrue(self.prescreen.needs_cookies)
+
+
+if __name__ == '__main__':
+    unittest.main()
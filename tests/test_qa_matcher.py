@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from qa_matcher import AnswerMatcher
+
+
+def brute_force(answers: dict, label: str):
+    # the earliest stored question contained in the label, what the old linear scan did
+    for question, answer in answers.items():
+        if question in label:
+            return answer
+    return None
+
+
+class AnswerMatcherTest(unittest.TestCase):
+    def test_earliest_stored_question_wins(self):
+        matcher = AnswerMatcher({"years of experience": "4", "experience": "some"})
+        self.assertEqual(matcher.stored("How many years of experience do you have?"), "4")
+        self.assertEqual(matcher.stored("Describe your experience"), "some")
+        self.assertIsNone(matcher.stored("Are you willing to relocate?"))
+
+    def test_added_questions_match_before_and_after_merge(self):
+        matcher = AnswerMatcher({"notice period": "4 weeks"})
+        matcher.add("salary", "50000")
+        self.assertTrue(matcher.pending)
+        self.assertEqual(matcher.stored("Expected salary?"), "50000")
+        # a merged question still wins over a newer pending one
+        matcher.add("period", "other")
+        self.assertEqual(matcher.stored("What is your notice period?"), "4 weeks")
+        for i in range(AnswerMatcher.MERGE_AT - len(matcher.pending)):
+            matcher.add(f"question {i}", str(i))
+        self.assertFalse(matcher.pending)
+        self.assertEqual(matcher.stored("Expected salary?"), "50000")
+        self.assertEqual(matcher.stored("question 7?"), "7")
+
+    def test_same_question_keeps_priority(self):
+        matcher = AnswerMatcher({"visa": "No", "sponsor": "Maybe"})
+        matcher.add("visa", "Yes")
+        self.assertEqual(matcher.stored("visa sponsor needed?"), "Yes")
+        self.assertEqual(len(matcher), 2)
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        words = ["a", "ab", "abc", "b", "bc", "ca", "cab", "bca"]
+        answers = {}
+        matcher = AnswerMatcher()
+        for i in range(80):
+            question = rng.choice(words) + rng.choice(words)
+            if question not in answers:
+                answers[question] = str(i)
+            matcher.add(question, answers[question])
+            label = "".join(rng.choice("abc ") for _ in range(12))
+            self.assertEqual(matcher.stored(label), brute_force(answers, label), label)
+
+    def test_builtin_patterns_in_order(self):
+        matcher = AnswerMatcher(patterns=[(r"visa", "No"), (r"do you", "Yes")])
+        self.assertEqual(matcher.builtin("Do you need a visa?"), ("visa", "No"))
+        self.assertIsNone(matcher.builtin("Your name"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+from pagination import search_path
+from replay import ReplayServer, page_key, synthesize
+
+
+class SyntheticRecordingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        synthesize(cls.tmp.name, ["Software Engineer"], ["United Kingdom"], [1, 2],
+                   jobs=30, page_size=25)
+        cls.replay = ReplayServer(cls.tmp.name).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.replay.stop()
+        cls.tmp.cleanup()
+
+    def get(self, path: str) -> tuple:
+        try:
+            with urllib.request.urlopen(self.replay.base_url + path) as response:
+                return response.status, response.read().decode()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode()
+
+    def search(self, start: int) -> tuple:
+        # escaped the way the browser sends it
+        path = search_path("Software Engineer", "&location=United Kingdom", start, [1, 2])
+        return self.get(quote(path, safe="/?&=,"))
+
+    def test_search_pages_end_with_no_results(self):
+        status, body = self.search(0)
+        self.assertEqual((status, body.count("data-job-id=")), (200, 25))
+        self.assertEqual(self.search(25)[1].count("data-job-id="), 5)
+        self.assertIn("jobs-search-no-results-banner", self.search(30)[1])
+
+    def test_job_view_and_form_steps(self):
+        status, body = self.get("/jobs/view/4000000000/?trk=search")
+        self.assertEqual(status, 200)
+        self.assertIn("Easy Apply", body)
+        self.assertIn("/__replay/form/", body)
+        self.assertIn("Continue to next step", self.get("/__replay/form/4000000000/0")[1])
+        self.assertIn("Submit application", self.get("/__replay/form/4000000000/3")[1])
+
+    def test_unrecorded_page(self):
+        self.assertEqual(self.get("/jobs/view/1/")[0], 404)
+
+    def test_page_key_ignores_escaping(self):
+        self.assertEqual(page_key("http://host/jobs/search/?keywords=AI%20Developer&start=0"),
+                         "/jobs/search?keywords=AI Developer&start=0")
+        self.assertEqual(page_key("https://host/jobs/view/42/?trk=abc"), "/jobs/view/42")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import report
+from report import Report
+
+HEADER = "timestamp,jobID,job,company,attempted,result,position,location\n"
+
+
+def row(day: int, jobID: str, company: str, attempted: bool, applied: bool,
+        position="Engineer", location="Remote") -> str:
+    return (f"2026-10-{day:02d} 10:00:00,{jobID},Engineer,{company},{attempted},{applied},"
+            f"{position},{location}\n")
+
+
+class ReportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, "out.csv")
+        self.summary = os.path.join(self.tmp.name, "report.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text: str, mode="a") -> None:
+        with open(self.csv, mode, encoding="utf-8") as f:
+            f.write(text)
+
+    def run_report(self) -> tuple:
+        rep = Report(self.summary)
+        try:
+            count = rep.update(self.csv)
+            return count, rep.summary()
+        finally:
+            rep.close()
+
+    def test_totals_breakdowns_and_duplicates(self):
+        self.write(HEADER + row(1, "1", "ACME", True, True) + row(1, "2", "ACME", True, False)
+                   + row(2, "3", "Initech", False, False, location="London")
+                   + row(2, "1", "ACME", True, True), "w")
+        count, summary = self.run_report()
+        self.assertEqual(count, 5)
+        self.assertEqual((summary["rows"], summary["attempted"], summary["applied"]), (4, 3, 2))
+        self.assertEqual(summary["failures"], {"not_attempted": 1, "not_submitted": 1})
+        self.assertEqual(summary["company"][0], {"key": "ACME", "rows": 3, "attempted": 3,
+                                                 "applied": 2, "success_rate": 0.667})
+        self.assertEqual([d["key"] for d in summary["day"]], ["2026-10-02", "2026-10-01"])
+        self.assertEqual(summary["duplicates"]["applied_more_than_once"], 1)
+        self.assertEqual(summary["duplicates"]["top"], [{"jobID": "1", "rows": 2, "applied": 2}])
+
+    def test_later_reports_read_only_new_rows(self):
+        self.write(HEADER + row(1, "1", "ACME", True, True), "w")
+        self.assertEqual(self.run_report()[0], 2)
+        # a row still being written is left for next time
+        self.write(row(1, "2", "ACME", True, False).rstrip("\n"))
+        count, summary = self.run_report()
+        self.assertEqual((count, summary["rows"]), (0, 1))
+        self.write("\n" + row(2, "3", "ACME", True, True))
+        count, summary = self.run_report()
+        self.assertEqual((count, summary["rows"]), (2, 3))
+
+    def test_truncated_file_starts_over(self):
+        self.write(row(1, "1", "ACME", True, True) + row(1, "2", "ACME", True, True), "w")
+        self.run_report()
+        self.write(row(3, "9", "Initech", True, False), "w")
+        count, summary = self.run_report()
+        self.assertEqual((count, summary["rows"], summary["applied"]), (1, 1, 0))
+
+    def test_chunks_never_split_a_quoted_newline(self):
+        rows = "".join(row(1, str(i), f'"Line {i}\nbreak"' if i % 3 == 0 else "ACME", True, True)
+                       for i in range(10))
+        self.write(rows, "w")
+        with mock.patch.object(report, "CHUNK_ROWS", 2):
+            count, summary = self.run_report()
+        self.assertEqual((count, summary["rows"]), (10, 10))
+        self.assertIn("Line 0\nbreak", [c["key"] for c in summary["company"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
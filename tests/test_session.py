@@ -0,0 +1,79 @@
+import json
+import os
+import stat
+import tempfile
+import unittest
+
+from replay import ReplayServer, synthesize
+from session import SessionCache
+from tests.browser import HttpBrowser
+
+
+class SessionCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.recording = tempfile.TemporaryDirectory()
+        synthesize(cls.recording.name, ["Engineer"], ["Remote"], jobs=2)
+        cls.replay = ReplayServer(cls.recording.name).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.replay.stop()
+        cls.recording.cleanup()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.json")
+        self.cache = SessionCache(self.path, self.replay.base_url)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def logged_in(self) -> HttpBrowser:
+        browser = HttpBrowser()
+        browser.get(self.replay.base_url + "/feed/?session_key=user")
+        browser.local_storage["voyager"] = "state"
+        return browser
+
+    def test_restores_a_valid_session(self):
+        self.cache.save(self.logged_in())
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        browser = HttpBrowser()
+        self.assertTrue(self.cache.restore(browser))
+        self.assertEqual({"li_at", "JSESSIONID"}, set(browser.cookies))
+        self.assertEqual(browser.local_storage, {"voyager": "state"})
+        # robots.txt to get on the origin, one API call to check the session
+        self.assertEqual(browser.requests, ["/robots.txt", "/voyager/api/me"])
+
+    def test_expired_session_is_dropped(self):
+        self.cache.save(self.logged_in())
+        self.replay.sessions.clear()
+        browser = HttpBrowser()
+        self.assertFalse(self.cache.restore(browser))
+        self.assertEqual(browser.cookies, {})
+
+    def test_missing_or_unreadable_cache(self):
+        self.assertFalse(self.cache.restore(HttpBrowser()))
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertFalse(self.cache.restore(HttpBrowser()))
+        self.assertFalse(SessionCache(None, self.replay.base_url).restore(HttpBrowser()))
+
+    def test_apply_carries_a_captured_session_over(self):
+        state = self.cache.capture(self.logged_in())
+        json.dumps(state)  # what save() writes has to be serialisable
+        self.assertFalse(os.path.exists(self.path))
+        browser = HttpBrowser()
+        self.assertTrue(self.cache.apply(browser, state))
+        self.assertIn("li_at", browser.cookies)
+
+    def test_session_check_needs_the_csrf_token(self):
+        browser = self.logged_in()
+        self.assertTrue(self.cache.is_valid(browser))
+        del browser.cookies["JSESSIONID"]
+        self.assertFalse(self.cache.is_valid(browser))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+
+from checkpoint import worker_path
+from governor import Governor
+
+log = logging.getLogger(__name__)
+
+# seconds between worker start-ups, so the logins don't all hit LinkedIn at once
+STAGGER = 10
+
+
+def worker_main(worker_id: int, parameters: dict, tasks, governor_state=None) -> None:
+    # runs in its own process with its own browser, imported here to keep the
+    # parent free of a browser session
+    from easyapplybot import bot_from_config, setupLogger
+
+    setupLogger(parameters, f"applyJobs.worker{worker_id}")
+    # every worker exports its own timings
+    parameters = dict(parameters)
+    for key, default in (("metrics_json", "metrics.json"), ("metrics_prom", "metrics.prom")):
+        path = parameters.get(key, default)
+        if path:
+            root, ext = os.path.splitext(path)
+            parameters[key] = f"{root}.worker{worker_id}{ext}"
+    # and its own checkpoint, next to the parent's
+    if parameters.get("checkpoint_file", "checkpoint.json"):
+        parameters["checkpoint_file"] = worker_path(parameters.get("checkpoint_file", "checkpoint.json"),
+                                                    worker_id)
+    time.sleep(worker_id * STAGGER)
+    bot = bot_from_config(parameters, governor_state=governor_state)
+    bot.fill_data()
+    while True:
+        try:
+            task = tasks.get(timeout=5)
+        except queue.Empty:
+            break
+        if task is None:
+            break
+        try:
+            kind = task[0]
+            if kind == "combo":
+                _, position, location, start = task
+                log.info("[worker %s] Applying to %s: %s", worker_id, position, location)
+                bot.run_combo(position, "&location=" + location, start)
+            elif kind == "job":
+                # every job is queued once, a claim already on it was left by an
+                # interrupted run. The applied jobs index is shared, so a claim keeps two
+                # workers off one job.
+                bot.applied_store.release(task[1])
+                bot.apply_loop({task[1]: "To be processed"})
+        except Exception as e:
+            log.error("[worker %s] task %s failed: %s", worker_id, task, e)
+            bot.ensure_browser()
+    bot.close_harvest_browser()
+    log.info("[worker %s] No tasks left, exiting", worker_id)
+
+
+def run_pool(parameters: dict, combos: list, workers: int,
+             jobIDs: list | None = None) -> bool:
+    # one browser per process, all pulling (position, location, start) combos or single
+    # jobIDs from the same queue, combos are taken in the order given. True when every
+    # worker exited cleanly.
+    ctx = mp.get_context("spawn")
+    tasks = ctx.Queue()
+    # one rate governor for all workers, they share the account's limits
+    governor_state = Governor.shared_state(ctx)
+    for jobID in jobIDs or []:
+        tasks.put(("job", str(jobID)))
+    for position, location, start in combos:
+        tasks.put(("combo", position, location, start))
+    for _ in range(workers):
+        tasks.put(None)
+
+    log.info("Starting %s workers for %s combos", workers, len(combos))
+    procs = [ctx.Process(target=worker_main, args=(i, parameters, tasks, governor_state), daemon=False)
+             for i in range(workers)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    return all(proc.exitcode == 0 for proc in procs)